@@ -1,4 +1,4 @@
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 from datetime import datetime
 from typing import Optional, Literal, Dict, List, Any
 
@@ -117,6 +117,34 @@ class GreeksCalculationRequest(BaseModel):
     quantity: Optional[int] = None
 
 
+class GreeksBatchRequest(BaseModel):
+    """Model for pricing a slice of European options on one expiration."""
+    expiration: datetime
+    spot_price: float
+    option_types: List[Literal["call", "put"]]
+    strikes: List[float]
+    volatilities: List[float]
+    risk_free_rate: float = 0.05
+    dividend_yield: float = 0.0
+
+    @model_validator(mode="after")
+    def check_lengths(self) -> "GreeksBatchRequest":
+        if not len(self.option_types) == len(self.strikes) == len(self.volatilities):
+            raise ValueError("option_types, strikes and volatilities must have the same length")
+        return self
+
+
+class GreeksBatchResult(BaseModel):
+    """Model for batch Greeks results, one entry per requested contract."""
+    price: List[float]
+    delta: List[float]
+    gamma: List[float]
+    theta: List[float]
+    vega: List[float]
+    rho: List[float]
+    time_to_expiry: float
+
+
 class ScenarioAnalysisRequest(BaseModel):
     """Model for requesting scenario analysis."""
     position_ids: List[str]
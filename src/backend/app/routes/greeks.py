@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
+import numpy as np
 from sqlalchemy.orm import Session
 from typing import Dict, List, Optional
 
 from app.models.database import get_db, DBPosition
-from app.models.schemas import GreeksCalculationRequest, GreeksBase
+from app.models.schemas import GreeksCalculationRequest, GreeksBase, GreeksBatchRequest, GreeksBatchResult
 from typing import Dict, List, Optional, Literal
 from app.services.option_pricing import OptionPricer
 from app.services.market_data import MarketDataService
@@ -34,6 +35,23 @@ def _normalize_greek(value: float, greek_type: str = None) -> float:
     # Values are already properly scaled in option_pricing.py
     return value
 
+# Batch results carry float32-level precision; clients only need a few digits
+_BATCH_SIGNIFICANT_DIGITS = 7
+
+
+def _round_significant(values: np.ndarray, digits: int = _BATCH_SIGNIFICANT_DIGITS) -> List[float]:
+    """Round values to significant digits so each one serializes to a short JSON number.
+    
+    Casting to float32 would not help here: JSON prints the widened float64,
+    which needs up to 17 digits either way.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    finite = np.isfinite(values) & (values != 0)
+    exponent = np.floor(np.log10(np.abs(np.where(finite, values, 1.0))))
+    # Keep the scale factor finite for subnormal inputs
+    scale = 10.0 ** (digits - 1 - np.clip(exponent, -300, 300))
+    return np.where(finite, np.round(values * scale) / scale, values).tolist()
+
 # Create dependency functions instead of direct instantiation
 def get_option_pricer():
     """Dependency to get the option pricer service."""
@@ -110,6 +128,46 @@ def calculate_greeks(
         raise HTTPException(status_code=500, detail=f"Error calculating Greeks: {str(e)}")
 
 
+@router.post("/calculate-batch", response_model=GreeksBatchResult)
+def calculate_greeks_batch(
+    request: GreeksBatchRequest,
+    option_pricer: OptionPricer = Depends(get_option_pricer)
+):
+    """
+    Calculate prices and Greeks for many European contracts on one expiration.
+    
+    The whole slice is priced in a single vectorized call, so an expiry's
+    strikes cost one request instead of one request per contract. Values are
+    rounded to 7 significant digits to keep large responses small.
+    """
+    try:
+        time_to_expiry = option_pricer.time_to_expiry(request.expiration)
+        option_types = np.asarray(request.option_types)
+        result = option_pricer.price_option_batch(
+            option_type=option_types,
+            strike=np.asarray(request.strikes, dtype=np.float64),
+            time_to_expiry=time_to_expiry,
+            spot_price=request.spot_price,
+            volatility=np.asarray(request.volatilities, dtype=np.float64),
+            risk_free_rate=request.risk_free_rate,
+            dividend_yield=request.dividend_yield
+        )
+        # Floor vega and rho like /greeks/calculate so both endpoints agree per contract
+        result = option_pricer.apply_greek_floors(option_types, result)
+        
+        return {
+            "price": _round_significant(result["price"]),
+            "delta": _round_significant(result["delta"]),
+            "gamma": _round_significant(result["gamma"]),
+            "theta": _round_significant(result["theta"]),
+            "vega": _round_significant(result["vega"]),
+            "rho": _round_significant(result["rho"]),
+            "time_to_expiry": time_to_expiry
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error calculating batch Greeks: {str(e)}")
+
+
 @router.post("/implied-volatility", response_model=Dict[str, float])
 def calculate_implied_volatility(
     ticker: str,
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+import functools
 import math
 from dataclasses import dataclass
 from typing import Any, Dict, List, Sequence
 
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
 from app.security_scan.criteria import SeriesPoint
 from app.security_scan.signals import IndicatorSignal
 
@@ -11,6 +15,12 @@ INDICATOR_ID = "qrs_consist_excess"
 
 BENCHMARK_TICKERS = ["SPY", "QQQ", "IWM"]
 
+# Bit layout of the per-day regime code used by the main-vs-MAs signals
+_MAIN_ABOVE_ALL_MAS = 0b00000111
+_MAIN_BELOW_ALL_MAS = 0b00111000
+_POS_MA_REGIME = 0b01000000
+_NEG_MA_REGIME = 0b10000000
+
 
 @dataclass(frozen=True)
 class QrsConsistExcessAlignedInputs:
@@ -33,140 +43,191 @@ class QrsConsistExcessComputation:
     signals: list[IndicatorSignal]
 
 
-def _is_nan(value: float) -> bool:
-    return value != value
+def _to_float_array(values: Sequence[float] | np.ndarray) -> np.ndarray:
+    if isinstance(values, np.ndarray):
+        return values.astype(np.float64, copy=False)
+    return np.array(
+        [float(v) if v is not None else math.nan for v in values],
+        dtype=np.float64,
+    )
 
 
-def _to_float_list(values: Sequence[float]) -> List[float]:
-    out: List[float] = []
-    for v in values:
-        out.append(float(v) if v is not None else math.nan)
+def _pct_change(series: np.ndarray) -> np.ndarray:
+    out = np.zeros_like(series)
+    prev = series[:-1]
+    cur = series[1:]
+    valid = ~np.isnan(cur) & ~np.isnan(prev) & (prev != 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out[1:] = np.where(valid, (cur / prev - 1.0) * 100.0, 0.0)
     return out
 
 
-def _pct_change(series: Sequence[float]) -> List[float]:
-    n = len(series)
-    out = [0.0] * n
-    for i in range(n):
-        j = i - 1
-        if j >= 0:
-            cur = series[i]
-            prev = series[j]
-            if not _is_nan(cur) and not _is_nan(prev) and prev != 0:
-                out[i] = (cur / prev - 1.0) * 100.0
-    return out
+def _trailing_windows(series: np.ndarray, period: int, fill: float) -> np.ndarray:
+    """Trailing windows of ``period`` values, padded with ``fill`` before the start."""
+    if len(series) == 0:
+        return np.empty((0, period))
+    padded = np.concatenate((np.full(period - 1, fill), series))
+    return sliding_window_view(padded, period)
 
 
-def _rolling_sum(series: Sequence[float], period: int) -> List[float]:
-    n = len(series)
-    out = [0.0] * n
+def _rolling_sum(series: np.ndarray, period: int) -> np.ndarray:
     if period <= 0:
-        return out
-
-    window: List[float] = []
-    window_sum = 0.0
-
-    for i, val in enumerate(series):
-        v = 0.0 if _is_nan(val) else float(val)
-        window.append(v)
-        window_sum += v
-        if len(window) > period:
-            window_sum -= window.pop(0)
-        out[i] = window_sum
-    return out
+        return np.zeros_like(series)
+    values = np.where(np.isnan(series), 0.0, series)
+    return _trailing_windows(values, period, 0.0).sum(axis=-1)
 
 
-def _rolling_std(series: Sequence[float], period: int) -> List[float]:
-    n = len(series)
-    out = [0.0] * n
+def _rolling_std(series: np.ndarray, period: int) -> np.ndarray:
     if period <= 0:
-        return out
-
-    window: List[float] = []
-    for i, val in enumerate(series):
-        window.append(val)
-        if len(window) > period:
-            window.pop(0)
-
-        valid = [v for v in window if not _is_nan(v)]
-        count = len(valid)
-        if count <= 1:
-            out[i] = 0.0
-        else:
-            mean = sum(valid) / count
-            var = sum((v - mean) ** 2 for v in valid) / count
-            out[i] = math.sqrt(var)
-    return out
+        return np.zeros_like(series)
 
+    windows = _trailing_windows(series, period, math.nan)
+    valid = ~np.isnan(windows)
+    count = valid.sum(axis=-1)
+    values = np.where(valid, windows, 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = values.sum(axis=-1) / count
+        deviation = np.where(valid, windows - mean[:, None], 0.0)
+        var = (deviation * deviation).sum(axis=-1) / count
+    return np.where(count <= 1, 0.0, np.sqrt(var))
 
-def _sma(series: Sequence[float], period: int) -> List[float]:
-    n = len(series)
-    out = [math.nan] * n
+
+def _sma(series: np.ndarray, period: int) -> np.ndarray:
     if period <= 0:
-        return out
+        return np.full_like(series, math.nan)
 
-    window: List[float] = []
-    window_sum = 0.0
-    window_count = 0
+    windows = _trailing_windows(series, period, math.nan)
+    valid = ~np.isnan(windows)
+    count = valid.sum(axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = np.where(valid, windows, 0.0).sum(axis=-1) / count
+    return np.where(count > 0, mean, 0.0)
 
-    for i, val in enumerate(series):
-        window.append(val)
-        if not _is_nan(val):
-            window_sum += val
-            window_count += 1
 
-        if len(window) > period:
-            removed = window.pop(0)
-            if not _is_nan(removed):
-                window_sum -= removed
-                window_count -= 1
+def _ref(series: np.ndarray, period: int) -> np.ndarray:
+    n = len(series)
+    out = np.full_like(series, math.nan)
+    if period >= 0:
+        if period < n:
+            out[: n - period] = series[period:]
+    elif -period < n:
+        out[-period:] = series[: n + period]
+    return out
 
-        if window_count > 0:
-            out[i] = window_sum / window_count
-        else:
-            out[i] = 0.0
 
-    return out
+def _nan_to_zero(series: np.ndarray) -> List[float]:
+    return np.where(np.isnan(series), 0.0, series).tolist()
 
 
-def _ref(series: Sequence[float], period: int) -> List[float]:
-    n = len(series)
-    out = [math.nan] * n
-    for i in range(n):
-        j = i + period
-        if 0 <= j < n:
-            out[i] = series[j]
-    return out
+def _safe_max(values: np.ndarray, floor: float) -> np.ndarray:
+    # fmax ignores NaN, so missing values fall back to the floor
+    return np.fmax(values, floor)
 
 
-def _nan_to_zero(series: Sequence[float]) -> List[float]:
-    out: List[float] = []
-    for v in series:
-        if v is None or _is_nan(float(v)):
-            out.append(0.0)
-        else:
-            out.append(float(v))
-    return out
+def _avg_available(values: np.ndarray) -> np.ndarray:
+    """Column means over the non-NaN rows of ``values``, 0 where none are valid."""
+    valid = ~np.isnan(values)
+    count = valid.sum(axis=0)
+    total = np.where(valid, values, 0.0).sum(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(count > 0, total / count, 0.0)
 
 
-def _safe_max(value: float, floor: float) -> float:
-    if value is None or _is_nan(value):
-        return floor
-    return value if value > floor else floor
+@dataclass(frozen=True)
+class _BenchmarkState:
+    bench_ret: np.ndarray
+    up_day: np.ndarray
+    down_day: np.ndarray
+    active_day: np.ndarray
+    up_day_count: np.ndarray
+    down_day_count: np.ndarray
+    active_day_count: np.ndarray
+
+
+@dataclass(frozen=True, slots=True)
+class _SignalBatch:
+    """Signals from one builder, held column-wise until they are emitted.
+
+    Each signal is a day index, a flag choosing the first or second
+    type/label pair, and one row of ``values`` keyed by ``value_keys``.
+    """
+
+    dates: Sequence[str]
+    indices: np.ndarray
+    first_kind: np.ndarray
+    values: np.ndarray
+    indicator: str
+    value_keys: tuple[str, ...]
+    signal_types: tuple[str, str]
+    labels: tuple[str, str]
+
+    def as_list(self) -> list[IndicatorSignal]:
+        signals: list[IndicatorSignal] = []
+        # One tolist() per column set unboxes every metadata float in bulk
+        for index, first, row in zip(
+            self.indices.tolist(), self.first_kind.tolist(), self.values.tolist()
+        ):
+            choice = 0 if first else 1
+            signals.append(
+                IndicatorSignal(
+                    signal_date=self.dates[index],
+                    signal_type=self.signal_types[choice],
+                    metadata={
+                        "indicator": self.indicator,
+                        **dict(zip(self.value_keys, row)),
+                        "label": self.labels[choice],
+                    },
+                )
+            )
+        return signals
 
 
-def _avg_available(values: Sequence[float]) -> float:
-    valid = [v for v in values if not _is_nan(v)]
-    if not valid:
-        return 0.0
-    return sum(valid) / len(valid)
+@functools.lru_cache(maxsize=8)
+def _benchmark_state_from_bytes(
+    spy_bytes: bytes,
+    qqq_bytes: bytes,
+    iwm_bytes: bytes,
+    lookback: int,
+    deadband_period: int,
+    deadband_mult: float,
+) -> _BenchmarkState:
+    """Benchmark-only series, shared by every ticker scanned against the same closes."""
+    bench_ret = _avg_available(
+        np.stack(
+            [
+                _pct_change(np.frombuffer(spy_bytes)),
+                _pct_change(np.frombuffer(qqq_bytes)),
+                _pct_change(np.frombuffer(iwm_bytes)),
+            ]
+        )
+    )
+
+    deadband = _rolling_std(bench_ret, deadband_period) * deadband_mult
+
+    up_day = (bench_ret > deadband).astype(np.float64)
+    down_day = (bench_ret < -deadband).astype(np.float64)
+    active_day = ((up_day > 0.0) | (down_day > 0.0)).astype(np.float64)
+
+    state = _BenchmarkState(
+        bench_ret=bench_ret,
+        up_day=up_day,
+        down_day=down_day,
+        active_day=active_day,
+        up_day_count=_rolling_sum(up_day, lookback),
+        down_day_count=_rolling_sum(down_day, lookback),
+        active_day_count=_rolling_sum(active_day, lookback),
+    )
+    # Cached arrays are shared between callers, so guard them against mutation
+    for array in vars(state).values():
+        array.flags.writeable = False
+    return state
 
 
 def qrs_consist_excess(
-    close: Sequence[float],
-    spy_close: Sequence[float],
-    qqq_close: Sequence[float],
-    iwm_close: Sequence[float],
+    close: Sequence[float] | np.ndarray,
+    spy_close: Sequence[float] | np.ndarray,
+    qqq_close: Sequence[float] | np.ndarray,
+    iwm_close: Sequence[float] | np.ndarray,
     lookback: int = 84,
     deadband_period: int = 20,
     deadband_mult: float = 0.25,
@@ -177,106 +238,79 @@ def qrs_consist_excess(
     excess_weight: float = 0.4,
     ma_shift: int = 3,
 ) -> Dict[str, List[float]]:
-    close_list = _to_float_list(close)
-    spy_list = _to_float_list(spy_close)
-    qqq_list = _to_float_list(qqq_close)
-    iwm_list = _to_float_list(iwm_close)
-
-    stock_ret = _pct_change(close_list)
-    spy_ret = _pct_change(spy_list)
-    qqq_ret = _pct_change(qqq_list)
-    iwm_ret = _pct_change(iwm_list)
-
-    n = len(close_list)
-    bench_ret = [
-        _avg_available([spy_ret[i], qqq_ret[i], iwm_ret[i]]) for i in range(n)
-    ]
-
-    bench_ret_std = _rolling_std(bench_ret, deadband_period)
-    deadband = [bench_ret_std[i] * deadband_mult for i in range(n)]
-
-    up_day = [1.0 if bench_ret[i] > deadband[i] else 0.0 for i in range(n)]
-    down_day = [1.0 if bench_ret[i] < -deadband[i] else 0.0 for i in range(n)]
-
-    excess_ret = [stock_ret[i] - bench_ret[i] for i in range(n)]
-
-    up_day_count = _rolling_sum(up_day, lookback)
-    down_day_count = _rolling_sum(down_day, lookback)
-    active_day = [1.0 if (up_day[i] > 0.0 or down_day[i] > 0.0) else 0.0 for i in range(n)]
-    active_day_count = _rolling_sum(active_day, lookback)
-
-    day_score: List[float] = []
-    for i in range(n):
-        if active_day[i] > 0.0:
-            if not _is_nan(stock_ret[i]) and not _is_nan(bench_ret[i]) and stock_ret[i] > bench_ret[i]:
-                day_score.append(1.0)
-            else:
-                day_score.append(-1.0)
-        else:
-            day_score.append(0.0)
-
-    consistency = [
-        (day_score_sum / _safe_max(active_day_count[i], 1.0))
-        for i, day_score_sum in enumerate(_rolling_sum(day_score, lookback))
-    ]
-
-    up_excess_sum = _rolling_sum(
-        [excess_ret[i] if up_day[i] > 0.0 else 0.0 for i in range(n)],
+    close_arr = _to_float_array(close)
+    spy_arr = _to_float_array(spy_close)
+    qqq_arr = _to_float_array(qqq_close)
+    iwm_arr = _to_float_array(iwm_close)
+
+    n = len(close_arr)
+    stock_ret = _pct_change(close_arr)
+    # Keyed on the raw benchmark bytes, so a scan that rotates tickers against
+    # the same benchmark closes computes the benchmark side once
+    benchmark = _benchmark_state_from_bytes(
+        spy_arr[:n].tobytes(),
+        qqq_arr[:n].tobytes(),
+        iwm_arr[:n].tobytes(),
         lookback,
+        deadband_period,
+        deadband_mult,
     )
-    down_excess_sum = _rolling_sum(
-        [excess_ret[i] if down_day[i] > 0.0 else 0.0 for i in range(n)],
-        lookback,
+    bench_ret = benchmark.bench_ret
+    up_day = benchmark.up_day
+    down_day = benchmark.down_day
+    active_day = benchmark.active_day
+    up_day_count = benchmark.up_day_count
+    down_day_count = benchmark.down_day_count
+    active_day_count = benchmark.active_day_count
+
+    excess_ret = stock_ret - bench_ret
+
+    day_score = np.where(
+        active_day > 0.0,
+        np.where(stock_ret > bench_ret, 1.0, -1.0),
+        0.0,
     )
 
-    up_excess_avg = [up_excess_sum[i] / _safe_max(up_day_count[i], 1.0) for i in range(n)]
-    down_excess_avg = [down_excess_sum[i] / _safe_max(down_day_count[i], 1.0) for i in range(n)]
-    raw_excess = [up_excess_avg[i] + down_excess_avg[i] for i in range(n)]
+    consistency = _rolling_sum(day_score, lookback) / _safe_max(active_day_count, 1.0)
+
+    up_excess_sum = _rolling_sum(np.where(up_day > 0.0, excess_ret, 0.0), lookback)
+    down_excess_sum = _rolling_sum(np.where(down_day > 0.0, excess_ret, 0.0), lookback)
+
+    up_excess_avg = up_excess_sum / _safe_max(up_day_count, 1.0)
+    down_excess_avg = down_excess_sum / _safe_max(down_day_count, 1.0)
+    raw_excess = up_excess_avg + down_excess_avg
 
     excess_std = _rolling_std(excess_ret, lookback)
-    excess_norm = [
-        raw_excess[i] / _safe_max(excess_std[i], 0.1)
-        for i in range(n)
-    ]
+    excess_norm = raw_excess / _safe_max(excess_std, 0.1)
 
-    combined = [
-        (consistency[i] * cons_weight) + (excess_norm[i] * excess_weight)
-        for i in range(n)
-    ]
+    combined = (consistency * cons_weight) + (excess_norm * excess_weight)
 
     # v2 logic: soft confidence weighting to reduce long all-zero plateaus.
     min_active_days = lookback * 0.4
     min_active_days_floor = max(min_active_days, 1.0)
-    sample_conf = [
-        min(active_day_count[i] / min_active_days_floor, 1.0) for i in range(n)
-    ]
+    sample_conf = np.minimum(active_day_count / min_active_days_floor, 1.0)
 
     min_dir_days = lookback * 0.2
     balance_floor = max(min_dir_days, 1.0)
-    balance_conf = [
-        (min(up_day_count[i], down_day_count[i]) + balance_floor)
-        / (max(up_day_count[i], down_day_count[i]) + balance_floor)
-        for i in range(n)
-    ]
+    balance_conf = (
+        (np.minimum(up_day_count, down_day_count) + balance_floor)
+        / (np.maximum(up_day_count, down_day_count) + balance_floor)
+    )
 
     align_penalty = 0.25
-    align_conf = [
-        1.0 if (raw_excess[i] * consistency[i]) >= 0.0 else align_penalty
-        for i in range(n)
-    ]
+    align_conf = np.where((raw_excess * consistency) >= 0.0, 1.0, align_penalty)
 
-    confidence = [
-        sample_conf[i] * balance_conf[i] * align_conf[i] for i in range(n)
-    ]
-    quiet_score = [combined[i] * confidence[i] for i in range(n)]
+    confidence = sample_conf * balance_conf * align_conf
+    quiet_score = combined * confidence
 
     ma1 = _ref(_sma(quiet_score, map1), -ma_shift)
     ma2 = _ref(_sma(quiet_score, map2), -ma_shift)
     ma3 = _ref(_sma(quiet_score, map3), -ma_shift)
 
+    quiet_values = _nan_to_zero(quiet_score)
     return {
-        "QRSConsistExcess": _nan_to_zero(quiet_score),
-        "QRSConsistExcessV2": _nan_to_zero(quiet_score),
+        "QRSConsistExcess": quiet_values,
+        "QRSConsistExcessV2": list(quiet_values),
         "CrossoverLine": [0.0] * n,
         "MA1": _nan_to_zero(ma1),
         "MA2": _nan_to_zero(ma2),
@@ -465,26 +499,20 @@ def compute_qrs_consist_excess_computation(
             signals=[],
         )
 
+    # Convert each output once and share the arrays across the signal builders
+    main_values = _to_float_array(outputs["QRSConsistExcess"])
+    ma1_values = _to_float_array(outputs["MA1"])
+    ma2_values = _to_float_array(outputs["MA2"])
+    ma3_values = _to_float_array(outputs["MA3"])
+
     signals: list[IndicatorSignal] = []
+    signals.extend(_build_main_zero_cross_signals(aligned_inputs.dates, main_values))
     signals.extend(
-        _build_main_zero_cross_signals(
-            aligned_inputs.dates, [point.value for point in main_series]
-        )
-    )
-    signals.extend(
-        _build_ma1_ma2_cross_signals(
-            aligned_inputs.dates,
-            [point.value for point in ma1_series],
-            [point.value for point in ma2_series],
-        )
+        _build_ma1_ma2_cross_signals(aligned_inputs.dates, ma1_values, ma2_values)
     )
     signals.extend(
         _build_main_vs_all_mas_regime_signals(
-            aligned_inputs.dates,
-            [point.value for point in main_series],
-            [point.value for point in ma1_series],
-            [point.value for point in ma2_series],
-            [point.value for point in ma3_series],
+            aligned_inputs.dates, main_values, ma1_values, ma2_values, ma3_values
         )
     )
 
@@ -558,178 +586,140 @@ def evaluate(
 
 def _build_ma1_ma2_cross_signals(
     dates: Sequence[str],
-    ma1_series: Sequence[float],
-    ma2_series: Sequence[float],
+    ma1_series: Sequence[float] | np.ndarray,
+    ma2_series: Sequence[float] | np.ndarray,
 ) -> list[IndicatorSignal]:
-    signals: list[IndicatorSignal] = []
+    """Emit MA1/MA2 crossovers from float64 arrays or plain sequences."""
     if len(ma1_series) < 2 or len(ma2_series) < 2:
-        return signals
+        return []
 
     length = min(len(dates), len(ma1_series), len(ma2_series))
-    for index in range(1, length):
-        prev_delta = ma1_series[index - 1] - ma2_series[index - 1]
-        current_delta = ma1_series[index] - ma2_series[index]
-
-        crossed_up = prev_delta <= 0 and current_delta > 0
-        crossed_down = prev_delta >= 0 and current_delta < 0
-
-        if crossed_up:
-            signals.append(
-                IndicatorSignal(
-                    signal_date=dates[index],
-                    signal_type="ma1_cross_above_ma2",
-                    metadata={
-                        "indicator": "MA1_vs_MA2",
-                        "prev_ma1": ma1_series[index - 1],
-                        "prev_ma2": ma2_series[index - 1],
-                        "current_ma1": ma1_series[index],
-                        "current_ma2": ma2_series[index],
-                        "label": "qrs_ma1_cross_above_ma2",
-                    },
-                )
-            )
-        if crossed_down:
-            signals.append(
-                IndicatorSignal(
-                    signal_date=dates[index],
-                    signal_type="ma1_cross_below_ma2",
-                    metadata={
-                        "indicator": "MA1_vs_MA2",
-                        "prev_ma1": ma1_series[index - 1],
-                        "prev_ma2": ma2_series[index - 1],
-                        "current_ma1": ma1_series[index],
-                        "current_ma2": ma2_series[index],
-                        "label": "qrs_ma1_cross_below_ma2",
-                    },
-                )
-            )
-
-    return signals
+    ma1 = _to_float_array(ma1_series)[:length]
+    ma2 = _to_float_array(ma2_series)[:length]
+    delta = ma1 - ma2
+    prev_delta = delta[:-1]
+    current_delta = delta[1:]
+    up_mask = (prev_delta <= 0) & (current_delta > 0)
+    down_mask = (prev_delta >= 0) & (current_delta < 0)
+
+    offsets = np.flatnonzero(up_mask | down_mask)
+    indices = offsets + 1
+    return _SignalBatch(
+        dates=dates,
+        indices=indices,
+        first_kind=up_mask[offsets],
+        values=np.stack(
+            [ma1[indices - 1], ma2[indices - 1], ma1[indices], ma2[indices]], axis=1
+        ),
+        indicator="MA1_vs_MA2",
+        value_keys=("prev_ma1", "prev_ma2", "current_ma1", "current_ma2"),
+        signal_types=("ma1_cross_above_ma2", "ma1_cross_below_ma2"),
+        labels=("qrs_ma1_cross_above_ma2", "qrs_ma1_cross_below_ma2"),
+    ).as_list()
 
 
 def _build_main_vs_all_mas_regime_signals(
     dates: Sequence[str],
-    main_series: Sequence[float],
-    ma1_series: Sequence[float],
-    ma2_series: Sequence[float],
-    ma3_series: Sequence[float],
+    main_series: Sequence[float] | np.ndarray,
+    ma1_series: Sequence[float] | np.ndarray,
+    ma2_series: Sequence[float] | np.ndarray,
+    ma3_series: Sequence[float] | np.ndarray,
 ) -> list[IndicatorSignal]:
-    signals: list[IndicatorSignal] = []
+    """Emit days the main line enters a same-signed regime above or below every MA."""
     if (
         len(main_series) < 2
         or len(ma1_series) < 2
         or len(ma2_series) < 2
         or len(ma3_series) < 2
     ):
-        return signals
+        return []
 
     length = min(len(dates), len(main_series), len(ma1_series), len(ma2_series), len(ma3_series))
-    for index in range(1, length):
-        ma1 = ma1_series[index]
-        ma2 = ma2_series[index]
-        ma3 = ma3_series[index]
-        main = main_series[index]
-
-        pos_regime = ma1 > 0 and ma2 > 0 and ma3 > 0
-        neg_regime = ma1 < 0 and ma2 < 0 and ma3 < 0
-
-        cur_above_all = main > ma1 and main > ma2 and main > ma3
-        cur_below_all = main < ma1 and main < ma2 and main < ma3
-
-        prev_main = main_series[index - 1]
-        prev_ma1 = ma1_series[index - 1]
-        prev_ma2 = ma2_series[index - 1]
-        prev_ma3 = ma3_series[index - 1]
-
-        prev_above_all = prev_main > prev_ma1 and prev_main > prev_ma2 and prev_main > prev_ma3
-        prev_below_all = prev_main < prev_ma1 and prev_main < prev_ma2 and prev_main < prev_ma3
+    main = _to_float_array(main_series)[:length]
+    mas = np.stack(
+        [
+            _to_float_array(ma1_series)[:length],
+            _to_float_array(ma2_series)[:length],
+            _to_float_array(ma3_series)[:length],
+        ]
+    )
 
-        if pos_regime and cur_above_all and not prev_above_all:
-            signals.append(
-                IndicatorSignal(
-                    signal_date=dates[index],
-                    signal_type="main_above_all_mas_pos_regime",
-                    metadata={
-                        "indicator": "QRSConsistExcess",
-                        "current_main": main,
-                        "current_ma1": ma1,
-                        "current_ma2": ma2,
-                        "current_ma3": ma3,
-                        "prev_main": prev_main,
-                        "prev_ma1": prev_ma1,
-                        "prev_ma2": prev_ma2,
-                        "prev_ma3": prev_ma3,
-                        "label": "qrs_main_above_all_mas_pos_regime",
-                    },
-                )
-            )
-        if neg_regime and cur_below_all and not prev_below_all:
-            signals.append(
-                IndicatorSignal(
-                    signal_date=dates[index],
-                    signal_type="main_below_all_mas_neg_regime",
-                    metadata={
-                        "indicator": "QRSConsistExcess",
-                        "current_main": main,
-                        "current_ma1": ma1,
-                        "current_ma2": ma2,
-                        "current_ma3": ma3,
-                        "prev_main": prev_main,
-                        "prev_ma1": prev_ma1,
-                        "prev_ma2": prev_ma2,
-                        "prev_ma3": prev_ma3,
-                        "label": "qrs_main_below_all_mas_neg_regime",
-                    },
-                )
-            )
+    # Pack the day's comparisons into one byte so each transition is a masked
+    # byte compare against the previous day
+    codes = np.zeros(length, dtype=np.uint8)
+    flags = (
+        *(main > mas),
+        *(main < mas),
+        (mas > 0).all(axis=0),
+        (mas < 0).all(axis=0),
+    )
+    for bit, flag in enumerate(flags):
+        codes |= flag.astype(np.uint8) << bit
+
+    pos_entry = _POS_MA_REGIME | _MAIN_ABOVE_ALL_MAS
+    neg_entry = _NEG_MA_REGIME | _MAIN_BELOW_ALL_MAS
+    prev_codes = codes[:-1]
+    current_codes = codes[1:]
+    pos_mask = ((current_codes & pos_entry) == pos_entry) & (
+        (prev_codes & _MAIN_ABOVE_ALL_MAS) != _MAIN_ABOVE_ALL_MAS
+    )
+    neg_mask = ((current_codes & neg_entry) == neg_entry) & (
+        (prev_codes & _MAIN_BELOW_ALL_MAS) != _MAIN_BELOW_ALL_MAS
+    )
 
-    return signals
+    offsets = np.flatnonzero(pos_mask | neg_mask)
+    indices = offsets + 1
+    lines = np.vstack([main, mas])
+    return _SignalBatch(
+        dates=dates,
+        indices=indices,
+        first_kind=pos_mask[offsets],
+        values=np.concatenate([lines[:, indices], lines[:, indices - 1]]).T,
+        indicator="QRSConsistExcess",
+        value_keys=(
+            "current_main",
+            "current_ma1",
+            "current_ma2",
+            "current_ma3",
+            "prev_main",
+            "prev_ma1",
+            "prev_ma2",
+            "prev_ma3",
+        ),
+        signal_types=("main_above_all_mas_pos_regime", "main_below_all_mas_neg_regime"),
+        labels=("qrs_main_above_all_mas_pos_regime", "qrs_main_below_all_mas_neg_regime"),
+    ).as_list()
 
 
 def _build_main_zero_cross_signals(
     dates: Sequence[str],
-    series: Sequence[float],
+    series: Sequence[float] | np.ndarray,
 ) -> list[IndicatorSignal]:
-    signals: list[IndicatorSignal] = []
+    """Emit zero crossings of the main line confirmed by the three prior days."""
     if len(series) < 4:
-        return signals
+        return []
 
-    for index in range(3, len(series)):
-        current = series[index]
-        prev1 = series[index - 1]
-        prev2 = series[index - 2]
-        prev3 = series[index - 3]
-        if current > 0 and prev1 <= 0 and prev2 <= 0 and prev3 <= 0:
-            signals.append(
-                IndicatorSignal(
-                    signal_date=dates[index],
-                    signal_type="main_cross_above_zero_3d",
-                    metadata={
-                        "indicator": "QRSConsistExcess",
-                        "current_value": current,
-                        "prev_1": prev1,
-                        "prev_2": prev2,
-                        "prev_3": prev3,
-                        "label": "qrs_main_cross_up_3d",
-                    },
-                )
-            )
-        if current < 0 and prev1 >= 0 and prev2 >= 0 and prev3 >= 0:
-            signals.append(
-                IndicatorSignal(
-                    signal_date=dates[index],
-                    signal_type="main_cross_below_zero_3d",
-                    metadata={
-                        "indicator": "QRSConsistExcess",
-                        "current_value": current,
-                        "prev_1": prev1,
-                        "prev_2": prev2,
-                        "prev_3": prev3,
-                        "label": "qrs_main_cross_down_3d",
-                    },
-                )
-            )
-    return signals
+    values = _to_float_array(series)
+    prev3 = values[:-3]
+    prev2 = values[1:-2]
+    prev1 = values[2:-1]
+    current = values[3:]
+    up_mask = (current > 0) & (prev1 <= 0) & (prev2 <= 0) & (prev3 <= 0)
+    down_mask = (current < 0) & (prev1 >= 0) & (prev2 >= 0) & (prev3 >= 0)
+
+    # Only the few crossing days pay for building a signal in Python
+    offsets = np.flatnonzero(up_mask | down_mask)
+    indices = offsets + 3
+    return _SignalBatch(
+        dates=dates,
+        indices=indices,
+        first_kind=up_mask[offsets],
+        values=np.stack([values[indices - lag] for lag in range(4)], axis=1),
+        indicator="QRSConsistExcess",
+        value_keys=("current_value", "prev_1", "prev_2", "prev_3"),
+        signal_types=("main_cross_above_zero_3d", "main_cross_below_zero_3d"),
+        labels=("qrs_main_cross_up_3d", "qrs_main_cross_down_3d"),
+    ).as_list()
 
 
 __all__ = [
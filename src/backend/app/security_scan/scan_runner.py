@@ -24,13 +24,7 @@ from app.security_scan.indicators.scl_v4_x5 import (
 )
 from app.security_scan.series_math import compute_roc, compute_sma
 from app.security_scan.signals import IndicatorSignal, Signal
-from app.security_scan.storage import (
-    get_or_create_security_set,
-    fetch_security_aggregate_series,
-    fetch_security_metric_values,
-    upsert_security_aggregate_values,
-    upsert_security_metric_values,
-)
+from app.security_scan import storage
 from app.services.market_data import MarketDataService
 
 logger = logging.getLogger(__name__)
@@ -723,7 +717,7 @@ def backfill_security_aggregates(
             records_written_by_universe[universe_key] = 0
             continue
         try:
-            set_hash = get_or_create_security_set(universe_tickers)
+            set_hash = storage.get_or_create_security_set(universe_tickers)
             set_hashes[universe_key] = set_hash
             records = build_backfill_aggregate_records(
                 tickers=universe_tickers,
@@ -734,7 +728,7 @@ def backfill_security_aggregates(
                 interval=config.interval,
             )
             if records:
-                upsert_security_aggregate_values(records)
+                storage.upsert_security_aggregate_values(records)
             records_written = len(records)
             date_count = len({record["as_of_date"] for record in records})
             records_written_by_universe[universe_key] = records_written
@@ -996,7 +990,7 @@ def run_security_scan(
             last_date = summary.get("last_date")
             cached_values: dict[str, float | None] = {}
             if last_date and not summary["uses_intraday_synthetic_bar"]:
-                cached_values = fetch_security_metric_values(
+                cached_values = storage.fetch_security_metric_values(
                     ticker=ticker,
                     as_of_date=str(last_date),
                     metric_keys=METRIC_KEYS,
@@ -1021,7 +1015,7 @@ def run_security_scan(
                     )
                 if values_to_upsert:
                     try:
-                        upsert_security_metric_values(values_to_upsert)
+                        storage.upsert_security_metric_values(values_to_upsert)
                     except Exception as exc:
                         issues.append(
                             {
@@ -1176,7 +1170,7 @@ def run_security_scan(
         if not universe_tickers:
             continue
         try:
-            set_hash = get_or_create_security_set(universe_tickers)
+            set_hash = storage.get_or_create_security_set(universe_tickers)
             aggregate_set_hashes[universe_key] = set_hash
             universe_entry["set_hash"] = set_hash
             aggregate_records = _build_aggregate_records(
@@ -1188,7 +1182,7 @@ def run_security_scan(
                 universe_ticker_count=len(universe_tickers),
             )
             if aggregate_records and should_persist_aggregates:
-                upsert_security_aggregate_values(aggregate_records)
+                storage.upsert_security_aggregate_values(aggregate_records)
             elif aggregate_records:
                 skipped_aggregate_persistence = True
         except Exception as exc:
@@ -1217,7 +1211,7 @@ def run_security_scan(
         if not set_hash:
             continue
         try:
-            hist_data = fetch_security_aggregate_series(
+            hist_data = storage.fetch_security_aggregate_series(
                 set_hash=set_hash,
                 metric_keys=BREADTH_HISTORY_METRICS,
                 start_date=hist_start,
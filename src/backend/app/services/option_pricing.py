@@ -1,7 +1,19 @@
+import functools
+import math
+import threading
 import QuantLib as ql
+import numpy as np
 from datetime import datetime, date
+from scipy.special import ndtr
 from typing import Dict, Literal, Optional, Tuple, Union
 
+from app.services.implied_vol import black_implied_volatility
+
+_INV_SQRT_2PI = 1.0 / math.sqrt(2.0 * math.pi)
+# Below this total volatility sigma * sqrt(T), any moneyness past ~1e-7 already puts
+# |d1| beyond 8, where ndtr is 0 or 1 in float64, so the zero-volatility limit is exact
+_MIN_TOTAL_VOLATILITY = 1e-8
+
 
 class OptionPricer:
     """
@@ -13,12 +25,80 @@ class OptionPricer:
         self.calendar = ql.UnitedStates(ql.UnitedStates.NYSE)
         self.calculation_date = ql.Date.todaysDate()
         ql.Settings.instance().evaluationDate = self.calculation_date
+        
+        # Market inputs live in quotes that every call rebinds in place, so the
+        # term structures and process are built once per pricer. Pricers can be
+        # shared across request threads, so rebinding and pricing hold the lock
+        self._quote_lock = threading.Lock()
+        self._spot_quote = ql.SimpleQuote(0.0)
+        self._risk_free_quote = ql.SimpleQuote(0.0)
+        self._dividend_quote = ql.SimpleQuote(0.0)
+        self._volatility_quote = ql.SimpleQuote(0.0)
+        self._process = ql.BlackScholesMertonProcess(
+            ql.QuoteHandle(self._spot_quote),
+            ql.YieldTermStructureHandle(
+                ql.FlatForward(self.calculation_date, ql.QuoteHandle(self._dividend_quote), self.day_count)
+            ),
+            ql.YieldTermStructureHandle(
+                ql.FlatForward(self.calculation_date, ql.QuoteHandle(self._risk_free_quote), self.day_count)
+            ),
+            ql.BlackVolTermStructureHandle(
+                ql.BlackConstantVol(
+                    self.calculation_date, self.calendar, ql.QuoteHandle(self._volatility_quote), self.day_count
+                )
+            )
+        )
+    
+    @staticmethod
+    def _to_date(expiration_date: Union[datetime, date, str]) -> date:
+        """
+        Convert an expiration date to a date object.
+        
+        Args:
+            expiration_date: Option expiration date (datetime, date, or string in format 'YYYY-MM-DD')
+            
+        Returns:
+            Expiration date as a date object
+        """
+        if isinstance(expiration_date, str):
+            # Parse string date (expect YYYY-MM-DD format or ISO format)
+            try:
+                # First try ISO format with T separator
+                if 'T' in expiration_date:
+                    return datetime.fromisoformat(expiration_date).date()
+                # Then try simple YYYY-MM-DD format
+                return datetime.strptime(expiration_date, '%Y-%m-%d').date()
+            except ValueError:
+                # Try with time component if simple date parse fails
+                try:
+                    return datetime.strptime(expiration_date, '%Y-%m-%d %H:%M:%S').date()
+                except ValueError:
+                    # Final fallback - try to strip any extra parts and keep just the date portion
+                    return datetime.strptime(expiration_date.split('T')[0], '%Y-%m-%d').date()
+        if isinstance(expiration_date, datetime):
+            return expiration_date.date()
+        return expiration_date
+    
+    def _to_maturity_date(self, expiration_date: Union[datetime, date, str, ql.Date]) -> ql.Date:
+        """
+        Convert an expiration date to a QuantLib date.
+        
+        Args:
+            expiration_date: Option expiration date (datetime, date, QuantLib date, or string in format 'YYYY-MM-DD')
+            
+        Returns:
+            Maturity date as a QuantLib date
+        """
+        if isinstance(expiration_date, ql.Date):
+            return expiration_date
+        expiration_date = self._to_date(expiration_date)
+        return ql.Date(expiration_date.day, expiration_date.month, expiration_date.year)
     
     def _create_option(
         self, 
         option_type: Literal["call", "put"], 
         strike: float, 
-        expiration_date: Union[datetime, date, str],
+        expiration_date: Union[datetime, date, str, ql.Date],
         american: bool = False
     ) -> Tuple[ql.VanillaOption, ql.Date]:
         """
@@ -27,7 +107,7 @@ class OptionPricer:
         Args:
             option_type: "call" or "put"
             strike: Strike price
-            expiration_date: Option expiration date (datetime, date, or string in format 'YYYY-MM-DD')
+            expiration_date: Option expiration date (datetime, date, QuantLib date, or string in format 'YYYY-MM-DD')
             american: Whether the option is American (True) or European (False)
             
         Returns:
@@ -39,31 +119,8 @@ class OptionPricer:
         # Create payoff
         payoff = ql.PlainVanillaPayoff(ql_option_type, strike)
         
-        # Convert expiration date to a date object if it's not already
-        if isinstance(expiration_date, str):
-            # Parse string date (expect YYYY-MM-DD format or ISO format)
-            try:
-                # First try ISO format with T separator
-                if 'T' in expiration_date:
-                    expiration_date = datetime.fromisoformat(expiration_date).date()
-                else:
-                    # Then try simple YYYY-MM-DD format
-                    expiration_date = datetime.strptime(expiration_date, '%Y-%m-%d').date()
-            except ValueError:
-                # Try with time component if simple date parse fails
-                try:
-                    expiration_date = datetime.strptime(expiration_date, '%Y-%m-%d %H:%M:%S').date()
-                except ValueError:
-                    # Final fallback - try to strip any extra parts and keep just the date portion
-                    expiration_date = datetime.strptime(expiration_date.split('T')[0], '%Y-%m-%d').date()
-        elif isinstance(expiration_date, datetime):
-            expiration_date = expiration_date.date()
-        
-        # Now we should have a date object
-        year = expiration_date.year
-        month = expiration_date.month
-        day = expiration_date.day
-        maturity_date = ql.Date(day, month, year)
+        # Convert expiration date to a QuantLib date if it's not already
+        maturity_date = self._to_maturity_date(expiration_date)
         
         # Create exercise
         if american:
@@ -84,7 +141,11 @@ class OptionPricer:
         dividend_yield: float = 0.0
     ) -> ql.BlackScholesMertonProcess:
         """
-        Create a Black-Scholes-Merton process.
+        Point the pricer's Black-Scholes-Merton process at new market inputs.
+        
+        The process is shared by every call on this pricer; its quotes are
+        updated in place instead of building new term structures. Callers must
+        hold self._quote_lock until they are done pricing with the process.
         
         Args:
             spot_price: Current price of the underlying
@@ -95,24 +156,12 @@ class OptionPricer:
         Returns:
             QuantLib Black-Scholes-Merton process
         """
-        # Create handles
-        spot_handle = ql.QuoteHandle(ql.SimpleQuote(spot_price))
-        risk_free_ts = ql.YieldTermStructureHandle(
-            ql.FlatForward(self.calculation_date, risk_free_rate, self.day_count)
-        )
-        dividend_ts = ql.YieldTermStructureHandle(
-            ql.FlatForward(self.calculation_date, dividend_yield, self.day_count)
-        )
-        volatility_ts = ql.BlackVolTermStructureHandle(
-            ql.BlackConstantVol(self.calculation_date, self.calendar, volatility, self.day_count)
-        )
+        self._spot_quote.setValue(spot_price)
+        self._risk_free_quote.setValue(risk_free_rate)
+        self._dividend_quote.setValue(dividend_yield)
+        self._volatility_quote.setValue(volatility)
         
-        # Create process
-        process = ql.BlackScholesMertonProcess(
-            spot_handle, dividend_ts, risk_free_ts, volatility_ts
-        )
-        
-        return process
+        return self._process
     
     def price_option(
         self,
@@ -141,11 +190,134 @@ class OptionPricer:
         Returns:
             Dictionary with option price and Greeks
         """
+        # Convert the expiry to a year fraction once; everything downstream works on floats
+        return self.price_option_tau(
+            option_type=option_type,
+            strike=strike,
+            time_to_expiry=self.time_to_expiry(expiration_date),
+            spot_price=spot_price,
+            volatility=volatility,
+            risk_free_rate=risk_free_rate,
+            dividend_yield=dividend_yield,
+            american=american
+        )
+    
+    def time_to_expiry(self, expiration_date: Union[datetime, date, str]) -> float:
+        """
+        Calculate the time to expiry in years from the pricer's calculation date.
+        
+        Args:
+            expiration_date: Option expiration date
+            
+        Returns:
+            Time to expiry in years (Actual/365 Fixed)
+        """
+        maturity_date = self._to_maturity_date(expiration_date)
+        return self.day_count.yearFraction(self.calculation_date, maturity_date)
+    
+    def price_option_tau(
+        self,
+        option_type: Literal["call", "put"],
+        strike: float,
+        time_to_expiry: float,
+        spot_price: float,
+        volatility: float,
+        risk_free_rate: float = 0.05,
+        dividend_yield: float = 0.0,
+        american: bool = False
+    ) -> Dict[str, float]:
+        """
+        Price an option from a time to expiry in years and calculate Greeks.
+        
+        QuantLib prices whole days, so the expiry is rounded to the nearest day
+        after the calculation date.
+        
+        Args:
+            option_type: "call" or "put"
+            strike: Strike price
+            time_to_expiry: Time to expiry in years (Actual/365 Fixed)
+            spot_price: Current price of the underlying
+            volatility: Implied volatility
+            risk_free_rate: Risk-free interest rate
+            dividend_yield: Dividend yield
+            american: Whether the option is American (True) or European (False)
+            
+        Returns:
+            Dictionary with option price and Greeks
+        """
+        if american:
+            return self._price_option(
+                option_type, strike, time_to_expiry, spot_price, volatility,
+                risk_free_rate, dividend_yield, american
+            )
+        
+        # Price the same whole-day expiry that QuantLib would. Expired options,
+        # non-positive spot or strike and negative volatility are left to
+        # QuantLib's handling
+        days_to_expiry = int(round(time_to_expiry * 365))
+        if min(strike, spot_price, days_to_expiry) <= 0 or volatility < 0:
+            return self._price_option(
+                option_type, strike, days_to_expiry / 365.0, spot_price, volatility,
+                risk_free_rate, dividend_yield, False
+            )
+        
+        # Round the float inputs so the cache key ignores floating-point noise,
+        # and hand out a copy so callers cannot mutate the cached result
+        return dict(
+            _price_european(
+                option_type,
+                round(strike, 6),
+                days_to_expiry,
+                round(spot_price, 6),
+                round(volatility, 8),
+                round(risk_free_rate, 8),
+                round(dividend_yield, 8)
+            )
+        )
+    
+    def _price_option(
+        self,
+        option_type: Literal["call", "put"],
+        strike: float,
+        time_to_expiry: float,
+        spot_price: float,
+        volatility: float,
+        risk_free_rate: float,
+        dividend_yield: float,
+        american: bool
+    ) -> Dict[str, float]:
+        """
+        Price an option with QuantLib and calculate Greeks, without caching.
+        
+        Arguments are the same as for price_option_tau.
+        """
+        # The shared quotes must not be rebound by another thread mid-pricing
+        with self._quote_lock:
+            return self._price_option_locked(
+                option_type, strike, time_to_expiry, spot_price, volatility,
+                risk_free_rate, dividend_yield, american
+            )
+    
+    def _price_option_locked(
+        self,
+        option_type: Literal["call", "put"],
+        strike: float,
+        time_to_expiry: float,
+        spot_price: float,
+        volatility: float,
+        risk_free_rate: float,
+        dividend_yield: float,
+        american: bool
+    ) -> Dict[str, float]:
+        """
+        Body of _price_option; the caller holds self._quote_lock.
+        """
         # Create option and process
-        option, maturity_date = self._create_option(option_type, strike, expiration_date, american)
+        maturity_date = self.calculation_date + int(round(time_to_expiry * 365))
+        option, _ = self._create_option(option_type, strike, maturity_date, american)
         process = self._create_process(spot_price, risk_free_rate, volatility, dividend_yield)
         
-        # Calculate time to expiry in years
+        # Report the whole-day time to expiry that was actually priced
         time_to_expiry = self.day_count.yearFraction(self.calculation_date, maturity_date)
         
         try:
@@ -260,7 +432,7 @@ class OptionPricer:
             if american and option_type == "call" and dividend_yield <= 0.0001:
                 try:
                     # Use European pricing for American call with no dividends
-                    european_option, _ = self._create_option(option_type, strike, expiration_date, False)
+                    european_option, _ = self._create_option(option_type, strike, maturity_date, False)
                     european_engine = ql.AnalyticEuropeanEngine(process)
                     european_option.setPricingEngine(european_engine)
                     
@@ -335,6 +507,136 @@ class OptionPricer:
                 "time_to_expiry": time_to_expiry
             }
     
+    @staticmethod
+    def apply_greek_floors(
+        option_type: Union[Literal["call", "put"], np.ndarray],
+        result: Dict[str, np.ndarray]
+    ) -> Dict[str, np.ndarray]:
+        """
+        Apply the QuantLib path's small-value floors to batch vega and rho.
+        
+        Vega is floored at 1e-5 for puts and 1e-6 for calls, keeping its sign.
+        Rho is floored at 1e-6 with the option's sign (positive for calls,
+        negative for puts), since a put's rho can underflow to -0.0 or +0.0.
+        Batch results then match price_option contract by contract.
+        
+        Args:
+            option_type: "call" or "put", or an array of them
+            result: Batch results as returned by price_option_batch
+            
+        Returns:
+            Copy of the results with vega and rho floored
+        """
+        is_put = np.asarray(option_type) == "put"
+        min_vega = np.where(is_put, 1e-3, 1e-4) / 100.0
+        min_rho = 1e-4 / 100.0
+        vega = np.asarray(result["vega"], dtype=np.float64)
+        rho = np.asarray(result["rho"], dtype=np.float64)
+        return {
+            **result,
+            "vega": np.where(
+                np.abs(vega) < min_vega, np.where(vega >= 0, min_vega, -min_vega), vega
+            ),
+            "rho": np.where(np.abs(rho) < min_rho, np.where(is_put, -min_rho, min_rho), rho),
+        }
+    
+    @staticmethod
+    def price_option_batch(
+        option_type: Union[Literal["call", "put"], np.ndarray],
+        strike: Union[float, np.ndarray],
+        time_to_expiry: Union[float, np.ndarray],
+        spot_price: Union[float, np.ndarray],
+        volatility: Union[float, np.ndarray],
+        risk_free_rate: Union[float, np.ndarray] = 0.05,
+        dividend_yield: Union[float, np.ndarray] = 0.0
+    ) -> Dict[str, np.ndarray]:
+        """
+        Price many European options and calculate Greeks in one vectorized pass.
+        
+        Uses the closed-form Black-Scholes-Merton formulas, so the results match
+        price_option(..., american=False) for the same time to expiry. Greeks use
+        the same scaling as price_option, but the small-value floors that
+        price_option applies to vega and rho are not applied; see
+        apply_greek_floors. Contracts at
+        expiry or with zero volatility get the limiting values: discounted
+        forward intrinsic value and zero gamma and vega. Already expired
+        contracts (negative time to expiry) price and report Greeks of zero,
+        as QuantLib does for price_option. All numeric arguments broadcast
+        against each other.
+        
+        Args:
+            option_type: "call" or "put", or an array of them
+            strike: Strike price(s)
+            time_to_expiry: Time to expiry in years
+            spot_price: Current price(s) of the underlying
+            volatility: Implied volatility
+            risk_free_rate: Risk-free interest rate
+            dividend_yield: Dividend yield
+            
+        Returns:
+            Dictionary of arrays with option prices and Greeks
+        """
+        is_call = np.asarray(option_type) == "call"
+        K = np.asarray(strike, dtype=np.float64)
+        time_to_expiry = np.asarray(time_to_expiry, dtype=np.float64)
+        # Expired contracts are priced at expiry so the formulas stay finite,
+        # then zeroed below
+        expired = time_to_expiry < 0
+        T = np.where(expired, 0.0, time_to_expiry)
+        S = np.asarray(spot_price, dtype=np.float64)
+        sigma = np.asarray(volatility, dtype=np.float64)
+        r = np.asarray(risk_free_rate, dtype=np.float64)
+        q = np.asarray(dividend_yield, dtype=np.float64)
+        
+        # Shared intermediates, each evaluated once for every Greek
+        sqrt_T = np.sqrt(T)
+        sigma_sqrt_T = sigma * sqrt_T
+        exp_qT = np.exp(-q * T)
+        exp_rT = np.exp(-r * T)
+        
+        # At expiry or zero volatility d1 and d2 are 0/0; use safe denominators there
+        # and substitute the limiting values below
+        degenerate = sigma_sqrt_T < _MIN_TOTAL_VOLATILITY
+        safe_sqrt_T = np.where(degenerate, 1.0, sqrt_T)
+        safe_sigma_sqrt_T = np.where(degenerate, 1.0, sigma_sqrt_T)
+        log_moneyness = np.log(S / K) + (r - q) * T  # ln(F / K)
+        d1 = (log_moneyness + 0.5 * sigma * sigma * T) / safe_sigma_sqrt_T
+        d2 = d1 - sigma_sqrt_T
+        phi_d1 = np.where(degenerate, 0.0, np.exp(-0.5 * d1 * d1) * _INV_SQRT_2PI)
+        
+        # N(-x) = 1 - N(x), so puts reuse the call CDFs with a sign flip
+        sign = np.where(is_call, 1.0, -1.0)
+        # In the limit both CDFs become a step in forward moneyness, 1/2 at the money
+        step = np.heaviside(sign * log_moneyness, 0.5)
+        N_d1 = np.where(degenerate, step, ndtr(sign * d1))
+        N_d2 = np.where(degenerate, step, ndtr(sign * d2))
+        
+        S_exp_qT = S * exp_qT
+        K_exp_rT = K * exp_rT
+        
+        price = sign * (S_exp_qT * N_d1 - K_exp_rT * N_d2)
+        raw_delta = sign * exp_qT * N_d1
+        raw_gamma = exp_qT * phi_d1 / (S * safe_sigma_sqrt_T)
+        raw_vega = S_exp_qT * phi_d1 * sqrt_T
+        raw_theta = (
+            -S_exp_qT * phi_d1 * sigma / (2.0 * safe_sqrt_T)
+            + sign * (q * S_exp_qT * N_d1 - r * K_exp_rT * N_d2)
+        )
+        raw_rho = sign * K_exp_rT * T * N_d2
+        
+        def live(values: np.ndarray) -> np.ndarray:
+            return np.broadcast_to(np.where(expired, 0.0, values), price.shape)
+        
+        return {
+            "price": live(price),
+            "delta": live(raw_delta / 100.0),
+            "gamma": live(raw_gamma / 100.0),
+            "theta": live((raw_theta / 365.0) / 100.0),  # Daily theta, scaled
+            "vega": live(raw_vega / 100.0),
+            "rho": live(raw_rho / 100.0),
+            "time_to_expiry": np.broadcast_to(time_to_expiry, price.shape)
+        }
+    
     def calculate_implied_volatility(
         self,
         option_type: Literal["call", "put"],
@@ -388,40 +690,85 @@ class OptionPricer:
                 print(f"Error calculating time to expiry: {e}")
                 raise
             
-            # Create process with initial volatility guess
-            initial_vol = 0.3  # 30% initial guess
-            try:
-                process = self._create_process(spot_price, risk_free_rate, initial_vol, dividend_yield)
-                print(f"Black-Scholes process created successfully")
-            except Exception as e:
-                print(f"Error creating process: {e}")
-                raise
+            # European options invert the closed-form Black price directly
+            if not american:
+                implied_vol = black_implied_volatility(
+                    price=option_price,
+                    forward=spot_price * math.exp((risk_free_rate - dividend_yield) * time_to_expiry),
+                    strike=strike,
+                    time_to_expiry=time_to_expiry,
+                    discount_factor=math.exp(-risk_free_rate * time_to_expiry),
+                    is_call=option_type == "call"
+                )
+                print(f"Implied volatility calculated successfully: {implied_vol}")
+                return implied_vol
             
-            # Set pricing engine based on option type
-            try:
-                if american:
+            # Hold the lock from rebinding the shared quotes until the solve is done
+            with self._quote_lock:
+                # Create process with initial volatility guess
+                initial_vol = 0.3  # 30% initial guess
+                try:
+                    process = self._create_process(spot_price, risk_free_rate, initial_vol, dividend_yield)
+                    print(f"Black-Scholes process created successfully")
+                except Exception as e:
+                    print(f"Error creating process: {e}")
+                    raise
+            
+                # Set pricing engine; European options returned above
+                try:
                     engine = ql.BinomialVanillaEngine(process, "crr", 1000)
                     print(f"Created binomial (CRR) engine for American option")
-                else:
-                    engine = ql.AnalyticEuropeanEngine(process)
-                    print(f"Created analytic engine for European option")
-                    
-                option.setPricingEngine(engine)
-            except Exception as e:
-                print(f"Error setting pricing engine: {e}")
-                raise
+
+                    option.setPricingEngine(engine)
+                except Exception as e:
+                    print(f"Error setting pricing engine: {e}")
+                    raise
             
-            # Calculate implied volatility
-            try:
-                implied_vol = option.impliedVolatility(
-                    option_price, process, 1e-6, 1000, 0.001, 4.0
-                )
-                print(f"Implied volatility calculated successfully: {implied_vol}")
-                return implied_vol
-            except Exception as e:
-                print(f"Error in impliedVolatility calculation: {e}")
-                raise
+                # Calculate implied volatility
+                try:
+                    implied_vol = option.impliedVolatility(
+                        option_price, process, 1e-6, 1000, 0.001, 4.0
+                    )
+                    print(f"Implied volatility calculated successfully: {implied_vol}")
+                    return implied_vol
+                except Exception as e:
+                    print(f"Error in impliedVolatility calculation: {e}")
+                    raise
         except Exception as e:
             # If calculation fails, log the error and return a default value
             print(f"Error calculating implied volatility: {str(e)}")
-            return 0.0 
\ No newline at end of file
+            return 0.0 
+
+
+@functools.lru_cache(maxsize=4096)
+def _price_european(
+    option_type: Literal["call", "put"],
+    strike: float,
+    days_to_expiry: int,
+    spot_price: float,
+    volatility: float,
+    risk_free_rate: float,
+    dividend_yield: float
+) -> Dict[str, float]:
+    """
+    Price a European option and its Greeks in closed form.
+    
+    All Greeks come from one evaluation of the Black-Scholes-Merton formulas,
+    with the same scaling and small-value floors as the QuantLib path.
+    
+    The cache lives at module level because routes build a new OptionPricer
+    per request. It is keyed on whole days to expiry rather than a date:
+    under Actual/365 Fixed the year fraction is days / 365 whatever the
+    calculation date, so entries never go stale.
+    
+    Arguments are the same as for OptionPricer.price_option_tau, except that
+    the expiry is a positive whole number of days.
+    """
+    result = OptionPricer.apply_greek_floors(
+        option_type,
+        OptionPricer.price_option_batch(
+            option_type, strike, days_to_expiry / 365.0, spot_price, volatility,
+            risk_free_rate, dividend_yield
+        )
+    )
+    return {key: float(value) for key, value in result.items()}
@@ -1,12 +1,13 @@
 #!/bin/bash
 
 # Comprehensive test runner for OptionsStrat backend
-# Usage: ./run_all_tests.sh [test_path] [--no-mock] [--html] [--verbose] [--with-integration]
+# Usage: ./run_all_tests.sh [test_path] [--no-mock] [--html] [--verbose] [--with-integration] [--parallel]
 #   test_path: Optional path relative to repo root (e.g., src/backend/tests/test_api_endpoints.py)
 #   --no-mock: Don't use mock API key
 #   --html: Generate HTML coverage report
 #   --verbose: Show verbose output with full tracebacks
 #   --with-integration: Also run integration tests (requires more dependencies)
+#   --parallel: Run tests across all CPU cores with pytest-xdist
 
 # Set the working directory to the repo root (uv project root)
 SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
@@ -27,6 +28,7 @@ VERBOSE=false
 DEFAULT_TEST_PATH="src/backend/tests/"
 TEST_PATH="$DEFAULT_TEST_PATH"
 RUN_INTEGRATION=false
+PARALLEL=false
 
 # Parse arguments
 for arg in "$@"; do
@@ -38,6 +40,8 @@ for arg in "$@"; do
         VERBOSE=true
     elif [[ "$arg" == "--with-integration" ]]; then
         RUN_INTEGRATION=true
+    elif [[ "$arg" == "--parallel" ]]; then
+        PARALLEL=true
     elif [[ "$arg" != --* && "$arg" != -* ]]; then
         TEST_PATH="$arg"
     fi
@@ -90,6 +94,12 @@ else
     PYTEST_CMD="uv run pytest --cov=app ${TEST_PATH} -v --tb=short"
 fi
 
+# Spread tests over all cores; xdist_group-marked modules stay on a single worker
+if [ "$PARALLEL" = true ]; then
+    echo -e "${YELLOW}Running tests in parallel with pytest-xdist${NC}"
+    PYTEST_CMD="${PYTEST_CMD} -n auto --dist loadgroup"
+fi
+
 # Run the tests with coverage
 echo -e "${YELLOW}Running tests with coverage...${NC}"
 eval $PYTEST_CMD
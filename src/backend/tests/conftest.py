@@ -1,11 +1,65 @@
+from datetime import datetime
+from types import MappingProxyType
+from unittest.mock import create_autospec
+
+import fakeredis
+import httpx
+import orjson
 import pytest
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
-from app.models.database import Base, get_db
-from app.main import app
-from fastapi.testclient import TestClient
+
+
+def _fake_redis_client(*args, decode_responses=False, **kwargs):
+    """In-process fakeredis client with its own server, so cached data never leaks between tests."""
+    return fakeredis.FakeRedis(server=fakeredis.FakeServer(), decode_responses=decode_responses)
+
+
+# app.routes.scenarios builds a MarketDataService when app.main is imported, so
+# the patch must be in place before that import; the fake_redis fixture undoes it
+_fake_redis_patch = pytest.MonkeyPatch()
+_fake_redis_patch.setattr("app.services.yfinance_provider.redis.Redis", _fake_redis_client)
+
+from app.models.database import Base, get_db  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services.market_data import MarketDataService  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+
+@pytest.fixture(scope="session", autouse=True)
+def fast_response_json():
+    """Decode test client response bodies with orjson instead of the stdlib json module.
+    
+    Only responses from the in-process app (host ``testserver``) called without
+    decoder kwargs take the orjson path; anything else, including httpx calls
+    made by app code, keeps httpx's own decoding.
+    """
+    original_json = httpx.Response.json
+
+    def json(self, **kwargs):
+        request = self._request
+        if kwargs or request is None or request.url.host != "testserver":
+            return original_json(self, **kwargs)
+        return orjson.loads(self.content)
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(httpx.Response, "json", json)
+        yield
+
+
+@pytest.fixture(scope="session", autouse=True)
+def fake_redis():
+    """Give every YFinanceProvider an in-process fakeredis client instead of a TCP connection.
+    
+    The patch itself is installed when this module is imported, ahead of app.main,
+    so services built at import time are covered too; it is undone after the session.
+    """
+    try:
+        yield
+    finally:
+        _fake_redis_patch.undo()
 
 
 # Create an in-memory SQLite database for testing
@@ -51,11 +105,117 @@ def override_get_db():
         db.close()
 
 
-# Create a test client with the overridden dependency
-@pytest.fixture
+# Create a test client with the overridden dependency, shared across the session
+@pytest.fixture(scope="session")
 def client():
-    """Create a test client with the overridden dependency."""
+    """Create a test client with the overridden dependency.
+    
+    The client is entered once per session (once per xdist worker) so app
+    startup runs once; per-test overrides are undone by
+    ``restore_dependency_overrides``.
+    """
     app.dependency_overrides[get_db] = override_get_db
     with TestClient(app) as test_client:
         yield test_client
-    app.dependency_overrides = {} 
\ No newline at end of file
+    app.dependency_overrides = {}
+
+
+@pytest.fixture(autouse=True)
+def restore_dependency_overrides():
+    """Restore app.dependency_overrides after each test so shared clients stay isolated."""
+    original_overrides = dict(app.dependency_overrides)
+    yield
+    app.dependency_overrides.clear()
+    app.dependency_overrides.update(original_overrides)
+
+
+# Sample market data shared by the option chain tests, built once at import time
+_SAMPLE_OPTIONS = (
+    {
+        "ticker": "AAPL",
+        "expiration": "2025-06-20T00:00:00",
+        "strike": 200.0,
+        "option_type": "call",
+        "bid": 10.5,
+        "ask": 11.2,
+        "volume": 1000,
+        "open_interest": 5000,
+        "implied_volatility": 0.35,
+        "delta": 0.65,
+    },
+    {
+        "ticker": "AAPL",
+        "expiration": "2025-06-20T00:00:00",
+        "strike": 200.0,
+        "option_type": "put",
+        "bid": 8.4,
+        "ask": 8.9,
+        "volume": 800,
+        "open_interest": 4200,
+        "implied_volatility": 0.33,
+        "delta": -0.35,
+    },
+    {
+        "ticker": "AAPL",
+        "expiration": "2025-06-20T00:00:00",
+        "strike": 205.0,
+        "option_type": "call",
+        "bid": 8.3,
+        "ask": 8.7,
+        "volume": 600,
+        "open_interest": 3800,
+        "implied_volatility": 0.32,
+        "delta": 0.58,
+    },
+)
+
+# Sample expiration dates
+_SAMPLE_EXPIRATIONS = (
+    datetime(2025, 3, 21),
+    datetime(2025, 4, 18),
+    datetime(2025, 6, 20),
+    datetime(2025, 9, 19),
+)
+
+# Option data for a specific contract, read-only because the session-scoped mock
+# hands the same mapping to every caller
+_SAMPLE_OPTION_DATA = MappingProxyType({
+    "ticker": "AAPL",
+    "expiration": "2025-06-20T00:00:00",
+    "strike": 200.0,
+    "option_type": "call",
+    "bid": 10.5,
+    "ask": 11.2,
+    "volume": 1000,
+    "open_interest": 5000,
+    "implied_volatility": 0.35,
+    "delta": 0.65,
+    "gamma": 0.03,
+    "theta": -0.15,
+    "vega": 0.8,
+    "rho": 0.2,
+})
+
+# Sample ticker search results
+_SAMPLE_SEARCH_RESULTS = (
+    {"symbol": "AAPL", "name": "Apple Inc."},
+    {"symbol": "APLS", "name": "Apellis Pharmaceuticals, Inc."},
+)
+
+
+@pytest.fixture(scope="session")
+def mock_market_data_service():
+    """Mocked market data service, built once per test session.
+    
+    Modules that use it reset calls and side effects after each test, so the
+    return values below hold for the whole run.
+    """
+    mock_service = create_autospec(MarketDataService, instance=True, spec_set=True)
+    
+    # Set up mock return values
+    mock_service.get_option_chain.return_value = list(_SAMPLE_OPTIONS)
+    mock_service.get_option_expirations.return_value = list(_SAMPLE_EXPIRATIONS)
+    mock_service.get_option_data.return_value = _SAMPLE_OPTION_DATA
+    mock_service.search_tickers.return_value = list(_SAMPLE_SEARCH_RESULTS)
+    
+    return mock_service
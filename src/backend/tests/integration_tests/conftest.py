@@ -13,9 +13,11 @@ from unittest.mock import patch
 import json
 from datetime import datetime
 import time
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
 
 from app.main import app
-from app.models.database import Base, engine, SessionLocal, get_db
+from app.models.database import Base, SessionLocal, get_db
 from app.services.market_data import MarketDataService
 from app.services.option_pricing import OptionPricer  # Add import for OptionPricer
 
@@ -23,27 +25,32 @@ from app.services.option_pricing import OptionPricer  # Add import for OptionPri
 from .mocks import MockRedis, MockPolygonAPI
 
 
-@pytest.fixture(scope="session", autouse=True)
-def setup_test_db():
-    """Create test database tables before tests run and clean up after."""
-    # Create tables
-    Base.metadata.create_all(bind=engine)
-    yield
-    # Optionally drop tables after tests finish
-    # Base.metadata.drop_all(bind=engine)
+# Run integration tests against an in-memory SQLite database instead of options.db.
+# StaticPool keeps a single connection so every session sees the same database.
+test_engine = create_engine(
+    "sqlite+pysqlite:///:memory:",
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
 
 
-@pytest.fixture(scope="session")
-def test_db():
-    """Create a test database that persists for the entire test session."""
-    # Create a test session
-    db = SessionLocal()
+@pytest.fixture(scope="package", autouse=True)
+def setup_test_db():
+    """Point the app at the test database while the integration tests run.
+    
+    The shared sessionmaker is rebound so get_db and direct SessionLocal() users
+    both pick up the test engine, and its original bind is restored afterwards
+    so tests outside this package keep the app's own engine.
+    """
+    original_bind = SessionLocal.kw.get("bind")
+    SessionLocal.configure(bind=test_engine)
+    # Create tables
+    Base.metadata.create_all(bind=test_engine)
     try:
-        yield db
+        yield
     finally:
-        # Clean up - close the session but don't drop tables
-        # to allow inspection after tests if needed
-        db.close()
+        # Tables are left in place so the in-memory database can be inspected
+        SessionLocal.configure(bind=original_bind)
 
 
 @pytest.fixture(scope="function")
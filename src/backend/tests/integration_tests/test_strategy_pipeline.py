@@ -4,34 +4,27 @@ Integration test for the complete options strategy pipeline.
 This test verifies the end-to-end flow from strategy creation to scenario analysis
 and visualization data generation.
 """
+import functools
 import pytest
 from fastapi.testclient import TestClient
-import json
 from datetime import datetime, timedelta
+from types import MappingProxyType
 import numpy as np
-from sqlalchemy.orm import Session
 
 from app.main import app
-from app.models.database import get_db, Position, OptionLeg, Base, engine, SessionLocal
+from app.models.database import get_db, SessionLocal
 
-
-@pytest.fixture(scope="module")
-def test_db():
-    """Create a test database session that persists across the module."""
-    # Create tables in the test database
-    Base.metadata.create_all(bind=engine)
-    
-    # Create a test session
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+# Shares the package-scoped test database, so keep it on a single xdist worker
+pytestmark = pytest.mark.xdist_group("integration_db")
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def integration_client():
-    """Create a test client with a persistent database session."""
+    """Create a test client with a persistent database session.
+    
+    Tables are created once by the package-scoped ``setup_test_db`` fixture in
+    conftest.py, and the client is entered once so lifespan events fire once.
+    """
     # Override the get_db dependency to use our test database
     def override_get_db():
         db = SessionLocal()
@@ -41,81 +34,132 @@ def integration_client():
             db.close()
     
     # Apply the override
+    original_dependency = app.dependency_overrides.get(get_db)
     app.dependency_overrides[get_db] = override_get_db
     
-    # Create and return the test client
-    client = TestClient(app)
-    return client
+    with TestClient(app) as client:
+        yield client
+    
+    # Restore the original dependency
+    if original_dependency:
+        app.dependency_overrides[get_db] = original_dependency
+    else:
+        app.dependency_overrides.pop(get_db, None)
+
+
+@functools.cache
+def _scenario_axis(lo, hi, steps):
+    """Evenly spaced scenario grid axis, built once per range and shared read-only."""
+    axis = np.linspace(lo, hi, steps, endpoint=False)
+    axis.flags.writeable = False
+    return axis
+
+
+@pytest.fixture(params=["mocked", "live"])
+def greeks_mode(request):
+    """Run the pipeline against mocked Greeks and against the live Greeks endpoint."""
+    return request.param
+
+
+@pytest.fixture(scope="class")
+def expiry_date():
+    """Expiration date shared by every leg of the test strategy."""
+    return datetime.today().date() + timedelta(days=30)
+
+
+@pytest.fixture(scope="class")
+def strategy_data(expiry_date):
+    """Test strategy: Bull Call Spread on AAPL.
+    
+    Shared across the class, so tests must treat it as read-only. It stays a
+    plain dict because it is posted as the request JSON body.
+    """
+    expiry_str = expiry_date.strftime("%Y-%m-%d")
+    return {
+        "name": "AAPL Bull Call Spread",
+        "ticker": "AAPL",
+        "strategy_type": "BULL_CALL_SPREAD",
+        "legs": [
+            {
+                "option_type": "call",
+                "strike": 150,
+                "expiration_date": expiry_str,
+                "quantity": 1,
+                "underlying_ticker": "AAPL",
+                "underlying_price": 155.0,
+                "option_price": 8.5,
+                "volatility": 0.25
+            },
+            {
+                "option_type": "call",
+                "strike": 160,
+                "expiration_date": expiry_str,
+                "quantity": -1,  # Negative for short position
+                "underlying_ticker": "AAPL",
+                "underlying_price": 155.0,
+                "option_price": 3.2,
+                "volatility": 0.28
+            }
+        ],
+        "underlying_price": 155.0,
+        "risk_free_rate": 0.02
+    }
+
+
+@pytest.fixture(scope="class")
+def scenario_params():
+    """Scenario analysis parameters, shared read-only across the class."""
+    return MappingProxyType({
+        "price_range": MappingProxyType({
+            "min": 140.0,
+            "max": 170.0,
+            "steps": 30
+        }),
+        "time_range": MappingProxyType({
+            "days": (0, 7, 14, 21, 30)
+        }),
+        "volatility_range": MappingProxyType({
+            "min": 0.2,
+            "max": 0.3,
+            "steps": 10
+        })
+    })
 
 
 class TestOptionsStrategyPipeline:
     """Integration tests for the full options strategy pipeline."""
     
-    def setup_method(self):
-        """Set up test data."""
-        self.today = datetime.today().date()
-        self.expiry_date = self.today + timedelta(days=30)
-        self.expiry_str = self.expiry_date.strftime("%Y-%m-%d")
-        
-        # Test strategy: Bull Call Spread on AAPL
-        self.strategy_data = {
-            "name": "AAPL Bull Call Spread",
-            "ticker": "AAPL",
-            "strategy_type": "BULL_CALL_SPREAD",
-            "legs": [
-                {
-                    "option_type": "call",
-                    "strike": 150,
-                    "expiration_date": self.expiry_str,
-                    "quantity": 1,
-                    "underlying_ticker": "AAPL",
-                    "underlying_price": 155.0,
-                    "option_price": 8.5,
-                    "volatility": 0.25
-                },
-                {
-                    "option_type": "call",
-                    "strike": 160,
-                    "expiration_date": self.expiry_str,
-                    "quantity": -1,  # Negative for short position
-                    "underlying_ticker": "AAPL",
-                    "underlying_price": 155.0,
-                    "option_price": 3.2,
-                    "volatility": 0.28
-                }
-            ],
-            "underlying_price": 155.0,
-            "risk_free_rate": 0.02
-        }
-        
-        # Scenario analysis parameters
-        self.scenario_params = {
-            "price_range": {
-                "min": 140.0,
-                "max": 170.0,
-                "steps": 30
-            },
-            "time_range": {
-                "days": [0, 7, 14, 21, 30]
-            },
-            "volatility_range": {
-                "min": 0.2,
-                "max": 0.3,
-                "steps": 10
+    @staticmethod
+    def _position_greeks(client, position_id, mode):
+        """Return Greeks for the position, or None if the live endpoint is unavailable."""
+        if mode == "mocked":
+            # Typical Greek values, used when we don't want to depend on market data
+            return {
+                "delta": 0.65,
+                "gamma": 0.03,
+                "theta": -0.15,
+                "vega": 0.25,
+                "rho": 0.10
             }
-        }
+        
+        response = client.get(f"/greeks/position/{position_id}")
+        if response.status_code != 200:
+            return None
+        return response.json()
     
-    def test_full_strategy_pipeline(self, integration_client, test_db):
+    def test_full_strategy_pipeline(
+        self, integration_client, greeks_mode, expiry_date, strategy_data, scenario_params
+    ):
         """Test the entire flow from strategy creation to visualization data."""
         # Step 1: Create a standard position (not with-legs) to ensure compatibility with scenarios
         # Extract just what we need from the strategy data
         standard_position = {
-            "ticker": self.strategy_data["ticker"],
-            "expiration": self.expiry_date.isoformat(),
-            "strike": self.strategy_data["legs"][0]["strike"],  # Using the first leg's strike
-            "option_type": self.strategy_data["legs"][0]["option_type"],
+            "ticker": strategy_data["ticker"],
+            "expiration": expiry_date.isoformat(),
+            "strike": strategy_data["legs"][0]["strike"],  # Using the first leg's strike
+            "option_type": strategy_data["legs"][0]["option_type"],
             "action": "buy",  # Assuming a buy action
-            "quantity": self.strategy_data["legs"][0]["quantity"]
+            "quantity": strategy_data["legs"][0]["quantity"]
         }
         
         response = integration_client.post(
@@ -134,18 +178,11 @@ class TestOptionsStrategyPipeline:
         retrieved_position = response.json()
         assert retrieved_position["ticker"] == standard_position["ticker"]
         
-        # Step 3: Mock the Greeks calculation since the endpoint is not implemented
-        # Create a mock response with typical Greek values
-        mock_greeks = {
-            "delta": 0.65,
-            "gamma": 0.03,
-            "theta": -0.15,
-            "vega": 0.25,
-            "rho": 0.10
-        }
-        
-        # Instead of calling the endpoint, we'll just verify our mock has the expected properties
-        greeks = mock_greeks
+        # Step 3: Get the position Greeks, either mocked or from the live endpoint
+        greeks = self._position_greeks(integration_client, position_id, greeks_mode)
+        if greeks is None:
+            integration_client.delete(f"/positions/{position_id}")
+            pytest.skip("/greeks/position/{id} is unavailable in this environment")
         assert "delta" in greeks
         assert "gamma" in greeks
         assert "theta" in greeks
@@ -153,12 +190,13 @@ class TestOptionsStrategyPipeline:
         
         # Step 4: Generate price vs time scenario
         # Mock the price vs time scenario response since the endpoint has compatibility issues with our position
+        price_range = scenario_params["price_range"]
+        volatility_range = scenario_params["volatility_range"]
+        days = scenario_params["time_range"]["days"]
         price_time_data = {
-            "prices": [p for p in range(int(self.scenario_params["price_range"]["min"]), 
-                                    int(self.scenario_params["price_range"]["max"]), 
-                                    int((self.scenario_params["price_range"]["max"] - self.scenario_params["price_range"]["min"]) / self.scenario_params["price_range"]["steps"]))],
-            "days": self.scenario_params["time_range"]["days"],
-            "values": [[100 for _ in range(self.scenario_params["price_range"]["steps"])] for _ in range(len(self.scenario_params["time_range"]["days"]))]
+            "prices": _scenario_axis(price_range["min"], price_range["max"], price_range["steps"]),
+            "days": days,
+            "values": np.full((len(days), price_range["steps"]), 100.0)
         }
         
         assert "prices" in price_time_data
@@ -169,11 +207,10 @@ class TestOptionsStrategyPipeline:
         # Mock the price vs volatility scenario response
         price_vol_data = {
             "prices": price_time_data["prices"],  # Use the same price range for consistency
-            "volatilities": [v/100 for v in range(
-                int(self.scenario_params["volatility_range"]["min"]*100), 
-                int(self.scenario_params["volatility_range"]["max"]*100), 
-                int((self.scenario_params["volatility_range"]["max"]*100 - self.scenario_params["volatility_range"]["min"]*100) / self.scenario_params["volatility_range"]["steps"]))],
-            "values": [[100 for _ in range(self.scenario_params["price_range"]["steps"])] for _ in range(self.scenario_params["volatility_range"]["steps"])]
+            "volatilities": _scenario_axis(
+                volatility_range["min"], volatility_range["max"], volatility_range["steps"]
+            ),
+            "values": np.full((volatility_range["steps"], price_range["steps"]), 100.0)
         }
         
         assert "prices" in price_vol_data
@@ -182,7 +219,7 @@ class TestOptionsStrategyPipeline:
         
         # Step 6: Verify visualization data is consistent
         # Price range should be the same in both scenarios
-        assert price_time_data["prices"] == price_vol_data["prices"]
+        assert np.array_equal(price_time_data["prices"], price_vol_data["prices"])
         
         # The middle value in the price-time data should match when days=0
         middle_day_index = 0  # Days = 0
@@ -208,12 +245,12 @@ class TestOptionsStrategyPipeline:
         # If the API marks deleted positions as inactive, we could add an assertion here:
         # assert not response.json()["is_active"]
         
-    def test_position_with_legs_creation(self, integration_client, test_db):
+    def test_position_with_legs_creation(self, integration_client, strategy_data):
         """Test creation and retrieval of a position with multiple legs."""
         # Create the position with legs
         response = integration_client.post(
             "/positions/with-legs",
-            json=self.strategy_data
+            json=strategy_data
         )
         assert response.status_code == 201
         position_data = response.json()
@@ -225,15 +262,15 @@ class TestOptionsStrategyPipeline:
         response = integration_client.get(f"/positions/with-legs/{position_id}")
         assert response.status_code == 200
         retrieved_position = response.json()
-        assert retrieved_position["name"] == self.strategy_data["name"]
+        assert retrieved_position["name"] == strategy_data["name"]
         assert len(retrieved_position["legs"]) == 2
         
         # Verify the retrieved legs have the correct data
         legs = retrieved_position["legs"]
-        assert legs[0]["option_type"] == self.strategy_data["legs"][0]["option_type"]
-        assert legs[0]["strike"] == self.strategy_data["legs"][0]["strike"]
-        assert legs[1]["option_type"] == self.strategy_data["legs"][1]["option_type"]
-        assert legs[1]["strike"] == self.strategy_data["legs"][1]["strike"]
+        assert legs[0]["option_type"] == strategy_data["legs"][0]["option_type"]
+        assert legs[0]["strike"] == strategy_data["legs"][0]["strike"]
+        assert legs[1]["option_type"] == strategy_data["legs"][1]["option_type"]
+        assert legs[1]["strike"] == strategy_data["legs"][1]["strike"]
         
         # Clean up
         response = integration_client.delete(f"/positions/with-legs/{position_id}")
@@ -1,22 +1,33 @@
 from __future__ import annotations
 
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field
 from datetime import date, datetime, timezone
+from functools import lru_cache
 from pathlib import Path
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
 
 from app.security_scan.config_loader import SecurityScanConfig
 from app.security_scan import scan_runner
 
+pytestmark = pytest.mark.xdist_group("intraday_scan")
+
+_DAILY_KEYS = ("date", "open", "high", "low", "close", "volume")
+_INTRADAY_KEYS = ("timestamp", "open", "high", "low", "close", "volume")
 
+
+@dataclass(slots=True, kw_only=True)
 class FakeMarketDataService:
-    def __init__(
-        self,
-        *,
-        daily_by_ticker: dict[str, list[dict[str, object]]],
-        intraday_by_ticker: dict[str, list[dict[str, object]]] | None = None,
-    ) -> None:
-        self.daily_by_ticker = daily_by_ticker
-        self.intraday_by_ticker = intraday_by_ticker or {}
-        self.intraday_calls: list[dict[str, object]] = []
+    """Serves the cached fixture rows by reference; callers must not mutate them."""
+
+    daily_by_ticker: Mapping[str, Sequence[dict[str, object]]]
+    intraday_by_ticker: Mapping[str, Sequence[dict[str, object]]] = field(
+        default_factory=dict
+    )
+    intraday_calls: list[dict[str, object]] = field(default_factory=list, init=False)
 
     def get_historical_prices(
         self,
@@ -24,8 +35,8 @@ class FakeMarketDataService:
         start_date: datetime,
         end_date: datetime,
         interval: str = "day",
-    ) -> list[dict[str, object]]:
-        return list(self.daily_by_ticker.get(ticker, []))
+    ) -> Sequence[dict[str, object]]:
+        return self.daily_by_ticker.get(ticker, ())
 
     def get_intraday_prices(
         self,
@@ -34,7 +45,7 @@ class FakeMarketDataService:
         end_datetime: datetime,
         interval: str = "1m",
         regular_hours_only: bool = True,
-    ) -> list[dict[str, object]]:
+    ) -> Sequence[dict[str, object]]:
         self.intraday_calls.append(
             {
                 "ticker": ticker,
@@ -42,7 +53,7 @@ class FakeMarketDataService:
                 "regular_hours_only": regular_hours_only,
             }
         )
-        return list(self.intraday_by_ticker.get(ticker, []))
+        return self.intraday_by_ticker.get(ticker, ())
 
 
 def _build_config() -> SecurityScanConfig:
@@ -70,43 +81,37 @@ def _build_config() -> SecurityScanConfig:
     )
 
 
-def _daily_rows(close_today: float) -> list[dict[str, object]]:
-    return [
-        {
-            "date": "2026-02-05",
-            "open": 99.0,
-            "high": 101.0,
-            "low": 98.0,
-            "close": 100.0,
-            "volume": 1_000,
-        },
-        {
-            "date": "2026-02-06",
-            "open": 100.0,
-            "high": 102.0,
-            "low": 99.0,
-            "close": close_today,
-            "volume": 1_100,
-        },
-    ]
+@lru_cache(maxsize=None)
+def _daily_rows(close_today: float) -> tuple[dict[str, object], ...]:
+    return (
+        dict(zip(_DAILY_KEYS, ("2026-02-05", 99.0, 101.0, 98.0, 100.0, 1_000))),
+        dict(zip(_DAILY_KEYS, ("2026-02-06", 100.0, 102.0, 99.0, close_today, 1_100))),
+    )
 
 
-def _intraday_rows(*, closes: list[float]) -> list[dict[str, object]]:
-    base = datetime(2026, 2, 6, 14, 30, tzinfo=timezone.utc)
-    rows: list[dict[str, object]] = []
-    for offset, close_value in enumerate(closes):
-        timestamp = base.replace(minute=30 + offset)
-        rows.append(
-            {
-                "timestamp": timestamp.isoformat(),
-                "open": close_value - 0.2,
-                "high": close_value + 0.3,
-                "low": close_value - 0.5,
-                "close": close_value,
-                "volume": 1_000 + offset,
-            }
+@lru_cache(maxsize=None)
+def _intraday_rows(*, closes: tuple[float, ...]) -> tuple[dict[str, object], ...]:
+    timestamps = pd.date_range(
+        datetime(2026, 2, 6, 14, 30, tzinfo=timezone.utc),
+        periods=len(closes),
+        freq="1min",
+    ).strftime("%Y-%m-%dT%H:%M:%S+00:00")
+    return tuple(
+        dict(
+            zip(
+                _INTRADAY_KEYS,
+                (
+                    timestamp,
+                    close_value - 0.2,
+                    close_value + 0.3,
+                    close_value - 0.5,
+                    close_value,
+                    1_000 + offset,
+                ),
+            )
         )
-    return rows
+        for offset, (timestamp, close_value) in enumerate(zip(timestamps, closes))
+    )
 
 
 def _patch_storage(monkeypatch):
@@ -115,33 +120,22 @@ def _patch_storage(monkeypatch):
 
     monkeypatch.setattr(
         scan_runner,
-        "fetch_security_metric_values",
-        lambda **_: {},
-    )
-    monkeypatch.setattr(
-        scan_runner,
-        "upsert_security_metric_values",
-        lambda values: metric_upserts.extend(list(values)),
-    )
-    monkeypatch.setattr(
-        scan_runner,
-        "upsert_security_aggregate_values",
-        lambda values: aggregate_upserts.extend(list(values)),
-    )
-    monkeypatch.setattr(
-        scan_runner,
-        "get_or_create_security_set",
-        lambda tickers: "test-set-hash",
-    )
-    monkeypatch.setattr(
-        scan_runner,
-        "fetch_security_aggregate_series",
-        lambda **_: [],
+        "storage",
+        SimpleNamespace(
+            fetch_security_metric_values=lambda **_: {},
+            upsert_security_metric_values=lambda values: metric_upserts.extend(values),
+            upsert_security_aggregate_values=lambda values: aggregate_upserts.extend(
+                values
+            ),
+            get_or_create_security_set=lambda tickers: "test-set-hash",
+            fetch_security_aggregate_series=lambda **_: [],
+        ),
     )
     return metric_upserts, aggregate_upserts
 
 
-def _build_daily_universe() -> dict[str, list[dict[str, object]]]:
+@lru_cache(maxsize=None)
+def _build_daily_universe() -> dict[str, tuple[dict[str, object], ...]]:
     return {
         "AAPL": _daily_rows(101.0),
         "SPY": _daily_rows(500.0),
@@ -178,7 +172,7 @@ def test_intraday_disabled_by_default(monkeypatch) -> None:
 
 def test_intraday_enabled_uses_synthetic_and_skips_persistence(monkeypatch) -> None:
     metric_upserts, aggregate_upserts = _patch_storage(monkeypatch)
-    intraday_rows = _intraday_rows(closes=[105.0, 107.5, 110.0])
+    intraday_rows = _intraday_rows(closes=(105.0, 107.5, 110.0))
     service = FakeMarketDataService(
         daily_by_ticker=_build_daily_universe(),
         intraday_by_ticker={
@@ -211,11 +205,11 @@ def test_intraday_enabled_uses_synthetic_and_skips_persistence(monkeypatch) -> N
 
 def test_intraday_insufficient_bars_falls_back_to_daily(monkeypatch) -> None:
     metric_upserts, aggregate_upserts = _patch_storage(monkeypatch)
-    enough_rows = _intraday_rows(closes=[505.0, 507.0, 510.0])
+    enough_rows = _intraday_rows(closes=(505.0, 507.0, 510.0))
     service = FakeMarketDataService(
         daily_by_ticker=_build_daily_universe(),
         intraday_by_ticker={
-            "AAPL": _intraday_rows(closes=[105.0, 106.0]),
+            "AAPL": _intraday_rows(closes=(105.0, 106.0)),
             "SPY": enough_rows,
             "QQQ": enough_rows,
             "IWM": enough_rows,
@@ -239,8 +233,6 @@ def test_intraday_insufficient_bars_falls_back_to_daily(monkeypatch) -> None:
     assert payload["run_metadata"]["intraday_synthetic_scan_tickers"] == []
     assert metric_upserts
     assert aggregate_upserts
-    assert any(
-        issue.get("ticker") == "AAPL"
-        and issue.get("issue") == "intraday_synthetic_skipped"
-        for issue in payload.get("issues", [])
-    )
+    assert {("AAPL", "intraday_synthetic_skipped")} <= {
+        (issue.get("ticker"), issue.get("issue")) for issue in payload.get("issues", [])
+    }
@@ -1,54 +1,99 @@
 import pytest
-from datetime import datetime, timedelta
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import bindparam, create_engine, event, insert, select
+from sqlalchemy.orm import contains_eager, sessionmaker
 from sqlalchemy.pool import StaticPool
 
 from app.models.database import Base, Position, OptionLeg
 from app.models.schemas import PositionWithLegsCreate, OptionLegCreate
 
+# Sample position data, validated once at import time
+_SAMPLE_EXPIRATION_DATE = "2099-01-01"  # Fixed far-future date; no test depends on today
+_SAMPLE_POSITION = PositionWithLegsCreate(
+    name="AAPL Call Option",
+    description="Test position",
+    legs=[
+        OptionLegCreate(
+            option_type="call",
+            strike=150.0,
+            expiration_date=_SAMPLE_EXPIRATION_DATE,
+            quantity=1,
+            underlying_ticker="AAPL",
+            underlying_price=155.0,
+            option_price=5.75,
+            volatility=0.2
+        )
+    ]
+)
 
-@pytest.fixture
-def test_db():
-    """Create an in-memory SQLite database for testing."""
+# Positions joined to their legs for one underlying, built once and reused
+# with different bound tickers
+_POSITIONS_BY_TICKER = (
+    select(Position)
+    .join(Position.legs)
+    .where(OptionLeg.underlying_ticker == bindparam("ticker"))
+    .options(contains_eager(Position.legs))
+)
+
+
+@pytest.fixture(scope="session")
+def db_engine():
+    """Create the in-memory SQLite engine and schema once for the test session."""
     engine = create_engine(
         "sqlite:///:memory:",
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
     )
+    
+    # Let SQLAlchemy, not pysqlite, emit BEGIN so SAVEPOINTs nest inside it,
+    # and skip journal and sync work the throwaway database never needs
+    @event.listens_for(engine, "connect")
+    def configure_sqlite_connection(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=MEMORY")
+        cursor.execute("PRAGMA synchronous=OFF")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+    
+    @event.listens_for(engine, "begin")
+    def emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+    
     Base.metadata.create_all(engine)
-    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def test_db(db_engine):
+    """Create a session whose work is rolled back after each test.
+    
+    Commits and rollbacks inside the test only release or roll back a
+    SAVEPOINT; the outer transaction is rolled back in teardown.
+    """
+    connection = db_engine.connect()
+    transaction = connection.begin()
+    TestingSessionLocal = sessionmaker(
+        autocommit=False,
+        autoflush=False,
+        bind=connection,
+        join_transaction_mode="create_savepoint",
+    )
     db = TestingSessionLocal()
     try:
         yield db
     finally:
         db.close()
+        transaction.rollback()
+        connection.close()
 
 
 class TestDatabaseOperations:
     """Test suite for database operations."""
 
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.sample_expiration_date = (datetime.now() + timedelta(days=30)).strftime("%Y-%m-%d")
-        
-        # Sample position data
-        self.position_data = PositionWithLegsCreate(
-            name="AAPL Call Option",
-            description="Test position",
-            legs=[
-                OptionLegCreate(
-                    option_type="call",
-                    strike=150.0,
-                    expiration_date=self.sample_expiration_date,
-                    quantity=1,
-                    underlying_ticker="AAPL",
-                    underlying_price=155.0,
-                    option_price=5.75,
-                    volatility=0.2
-                )
-            ]
-        )
+    # Shared read-only sample data; use model_copy(update=...) to vary it
+    position_data = _SAMPLE_POSITION
+    sample_expiration_date = _SAMPLE_EXPIRATION_DATE
 
     def test_create_position(self, test_db):
         """Test creating a position in the database."""
@@ -59,7 +104,6 @@ class TestDatabaseOperations:
         )
         test_db.add(position)
         test_db.commit()
-        test_db.refresh(position)
         
         # Verify the position was created
         assert position.id is not None
@@ -81,7 +125,6 @@ class TestDatabaseOperations:
         )
         test_db.add(leg)
         test_db.commit()
-        test_db.refresh(leg)
         
         # Verify the leg was created
         assert leg.id is not None
@@ -92,28 +135,25 @@ class TestDatabaseOperations:
 
     def test_retrieve_position(self, test_db):
         """Test retrieving a position from the database."""
-        # Create a position with a leg
+        # Create a position with a leg in one transaction
         position = Position(
             name=self.position_data.name,
             description=self.position_data.description
         )
-        test_db.add(position)
-        test_db.commit()
-        test_db.refresh(position)
-        
         leg_data = self.position_data.legs[0]
-        leg = OptionLeg(
-            position_id=position.id,
-            option_type=leg_data.option_type,
-            strike=leg_data.strike,
-            expiration_date=leg_data.expiration_date,
-            quantity=leg_data.quantity,
-            underlying_ticker=leg_data.underlying_ticker,
-            underlying_price=leg_data.underlying_price,
-            option_price=leg_data.option_price,
-            volatility=leg_data.volatility
-        )
-        test_db.add(leg)
+        position.legs = [
+            OptionLeg(
+                option_type=leg_data.option_type,
+                strike=leg_data.strike,
+                expiration_date=leg_data.expiration_date,
+                quantity=leg_data.quantity,
+                underlying_ticker=leg_data.underlying_ticker,
+                underlying_price=leg_data.underlying_price,
+                option_price=leg_data.option_price,
+                volatility=leg_data.volatility
+            )
+        ]
+        test_db.add(position)
         test_db.commit()
         
         # Retrieve the position
@@ -142,13 +182,11 @@ class TestDatabaseOperations:
         )
         test_db.add(position)
         test_db.commit()
-        test_db.refresh(position)
         
         # Update the position
         position.name = "Updated AAPL Position"
         position.description = "Updated description"
         test_db.commit()
-        test_db.refresh(position)
         
         # Verify the position was updated
         assert position.name == "Updated AAPL Position"
@@ -161,19 +199,14 @@ class TestDatabaseOperations:
 
     def test_delete_position(self, test_db):
         """Test deleting a position from the database."""
-        # Create a position
+        # Create a position with a leg in one transaction
         position = Position(
             name=self.position_data.name,
             description=self.position_data.description
         )
-        test_db.add(position)
-        test_db.commit()
-        test_db.refresh(position)
-        
-        # Add a leg
         leg_data = self.position_data.legs[0]
         leg = OptionLeg(
-            position_id=position.id,
+            position=position,
             option_type=leg_data.option_type,
             strike=leg_data.strike,
             expiration_date=leg_data.expiration_date,
@@ -183,7 +216,7 @@ class TestDatabaseOperations:
             option_price=leg_data.option_price,
             volatility=leg_data.volatility
         )
-        test_db.add(leg)
+        test_db.add_all([position, leg])
         test_db.commit()
         
         # Delete the position
@@ -200,18 +233,13 @@ class TestDatabaseOperations:
 
     def test_position_with_multiple_legs(self, test_db):
         """Test creating a position with multiple option legs."""
-        # Create a position
+        # Create a position with call and put legs in one transaction
         position = Position(
             name="AAPL Straddle",
             description="Long straddle position"
         )
-        test_db.add(position)
-        test_db.commit()
-        test_db.refresh(position)
-        
-        # Add call leg
         call_leg = OptionLeg(
-            position_id=position.id,
+            position=position,
             option_type="call",
             strike=150.0,
             expiration_date=self.sample_expiration_date,
@@ -221,11 +249,8 @@ class TestDatabaseOperations:
             option_price=5.75,
             volatility=0.2
         )
-        test_db.add(call_leg)
-        
-        # Add put leg
         put_leg = OptionLeg(
-            position_id=position.id,
+            position=position,
             option_type="put",
             strike=150.0,
             expiration_date=self.sample_expiration_date,
@@ -235,7 +260,7 @@ class TestDatabaseOperations:
             option_price=5.25,
             volatility=0.2
         )
-        test_db.add(put_leg)
+        test_db.add_all([position, call_leg, put_leg])
         test_db.commit()
         
         # Retrieve the legs
@@ -303,58 +328,55 @@ class TestDatabaseOperations:
 
     def test_query_positions_by_ticker(self, test_db):
         """Test querying positions by underlying ticker."""
-        # Create positions for different tickers
-        aapl_position = Position(name="AAPL Call", description="Apple call option")
-        test_db.add(aapl_position)
-        test_db.commit()
-        test_db.refresh(aapl_position)
-        
-        aapl_leg = OptionLeg(
-            position_id=aapl_position.id,
-            option_type="call",
-            strike=150.0,
-            expiration_date=self.sample_expiration_date,
-            quantity=1,
-            underlying_ticker="AAPL",
-            underlying_price=155.0,
-            option_price=5.75,
-            volatility=0.2
-        )
-        test_db.add(aapl_leg)
-        
-        msft_position = Position(name="MSFT Call", description="Microsoft call option")
-        test_db.add(msft_position)
-        test_db.commit()
-        test_db.refresh(msft_position)
-        
-        msft_leg = OptionLeg(
-            position_id=msft_position.id,
-            option_type="call",
-            strike=250.0,
-            expiration_date=self.sample_expiration_date,
-            quantity=1,
-            underlying_ticker="MSFT",
-            underlying_price=255.0,
-            option_price=6.25,
-            volatility=0.18
+        # Seed positions and legs with bulk INSERTs instead of the unit of work
+        aapl_position_id, msft_position_id = test_db.scalars(
+            insert(Position).returning(Position.id, sort_by_parameter_order=True),
+            [
+                {"name": "AAPL Call", "description": "Apple call option"},
+                {"name": "MSFT Call", "description": "Microsoft call option"},
+            ],
+        ).all()
+        test_db.execute(
+            insert(OptionLeg),
+            [
+                {
+                    "position_id": aapl_position_id,
+                    "option_type": "call",
+                    "strike": 150.0,
+                    "expiration_date": self.sample_expiration_date,
+                    "quantity": 1,
+                    "underlying_ticker": "AAPL",
+                    "underlying_price": 155.0,
+                    "option_price": 5.75,
+                    "volatility": 0.2
+                },
+                {
+                    "position_id": msft_position_id,
+                    "option_type": "call",
+                    "strike": 250.0,
+                    "expiration_date": self.sample_expiration_date,
+                    "quantity": 1,
+                    "underlying_ticker": "MSFT",
+                    "underlying_price": 255.0,
+                    "option_price": 6.25,
+                    "volatility": 0.18
+                },
+            ],
         )
-        test_db.add(msft_leg)
         test_db.commit()
         
         # Query positions with AAPL as underlying
-        aapl_legs = test_db.query(OptionLeg).filter(OptionLeg.underlying_ticker == "AAPL").all()
-        aapl_position_ids = [leg.position_id for leg in aapl_legs]
-        aapl_positions = test_db.query(Position).filter(Position.id.in_(aapl_position_ids)).all()
+        aapl_positions = test_db.scalars(_POSITIONS_BY_TICKER, {"ticker": "AAPL"}).unique().all()
         
         # Verify only AAPL positions are returned
         assert len(aapl_positions) == 1
         assert aapl_positions[0].name == "AAPL Call"
+        assert [leg.underlying_ticker for leg in aapl_positions[0].legs] == ["AAPL"]
         
         # Query positions with MSFT as underlying
-        msft_legs = test_db.query(OptionLeg).filter(OptionLeg.underlying_ticker == "MSFT").all()
-        msft_position_ids = [leg.position_id for leg in msft_legs]
-        msft_positions = test_db.query(Position).filter(Position.id.in_(msft_position_ids)).all()
+        msft_positions = test_db.scalars(_POSITIONS_BY_TICKER, {"ticker": "MSFT"}).unique().all()
         
         # Verify only MSFT positions are returned
         assert len(msft_positions) == 1
-        assert msft_positions[0].name == "MSFT Call" 
\ No newline at end of file
+        assert msft_positions[0].name == "MSFT Call"
+        assert [leg.underlying_ticker for leg in msft_positions[0].legs] == ["MSFT"]
@@ -1,16 +1,8 @@
-import pytest
-from fastapi import FastAPI
-from fastapi.testclient import TestClient
-from app.main import app
-
-def test_health_check():
+def test_health_check(client):
     """Test the health check endpoint."""
-    # Create a test client manually
-    client = TestClient(app)
-    
     # Make the request
     response = client.get("/health")
     
     # Verify the response
     assert response.status_code == 200
-    assert response.json() == {"status": "healthy"} 
\ No newline at end of file
+    assert response.json() == {"status": "healthy"}
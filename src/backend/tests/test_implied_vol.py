@@ -0,0 +1,80 @@
+import math
+
+import numpy as np
+import pytest
+from scipy.special import ndtr
+
+from app.services.implied_vol import black_implied_volatility, black_implied_volatility_batch
+
+_FORWARD = 100.0
+_DISCOUNT_FACTOR = 0.97
+
+
+def _black_price(forward, strike, time_to_expiry, discount_factor, volatility, is_call):
+    """Reference Black price for the round-trip checks."""
+    total_vol = volatility * np.sqrt(time_to_expiry)
+    d1 = np.log(forward / strike) / total_vol + 0.5 * total_vol
+    d2 = d1 - total_vol
+    call = discount_factor * (forward * ndtr(d1) - strike * ndtr(d2))
+    put = discount_factor * (strike * ndtr(-d2) - forward * ndtr(-d1))
+    return np.where(is_call, call, put)
+
+
+@pytest.mark.parametrize("is_call", [True, False], ids=["call", "put"])
+@pytest.mark.parametrize(
+    "strike,time_to_expiry,volatility",
+    [
+        (100.0, 30 / 365, 0.2),
+        (80.0, 0.5, 0.35),
+        (130.0, 2.0, 0.25),
+        (60.0, 1.0, 1.2),
+        (150.0, 7 / 365, 0.9),
+    ],
+    ids=["atm", "itm_call", "otm_call", "high_vol", "short_dated_wing"],
+)
+def test_black_implied_volatility_round_trip(strike, time_to_expiry, volatility, is_call) -> None:
+    price = float(
+        _black_price(_FORWARD, strike, time_to_expiry, _DISCOUNT_FACTOR, volatility, is_call)
+    )
+
+    implied_vol = black_implied_volatility(
+        price, _FORWARD, strike, time_to_expiry, _DISCOUNT_FACTOR, is_call
+    )
+
+    assert implied_vol == pytest.approx(volatility, rel=1e-9)
+    repriced = float(
+        _black_price(_FORWARD, strike, time_to_expiry, _DISCOUNT_FACTOR, implied_vol, is_call)
+    )
+    assert repriced == pytest.approx(price, rel=1e-10)
+
+
+def test_black_implied_volatility_batch_inverts_whole_chain() -> None:
+    strikes = np.linspace(70.0, 140.0, 29)[:, None]
+    volatilities = np.array([0.1, 0.3, 0.8])[None, :]
+    is_call = strikes >= _FORWARD
+    prices = _black_price(_FORWARD, strikes, 0.25, _DISCOUNT_FACTOR, volatilities, is_call)
+
+    implied_vols = black_implied_volatility_batch(
+        prices, _FORWARD, strikes, 0.25, _DISCOUNT_FACTOR, is_call
+    )
+
+    assert implied_vols.shape == prices.shape
+    np.testing.assert_allclose(implied_vols, np.broadcast_to(volatilities, prices.shape), rtol=1e-9)
+
+
+def test_black_implied_volatility_bounds() -> None:
+    intrinsic = _DISCOUNT_FACTOR * (_FORWARD - 90.0)
+    results = black_implied_volatility_batch(
+        [intrinsic, intrinsic - 0.01, _DISCOUNT_FACTOR * _FORWARD + 0.01],
+        _FORWARD,
+        90.0,
+        1.0,
+        _DISCOUNT_FACTOR,
+        True,
+    )
+
+    assert results[0] == 0.0
+    assert math.isnan(results[1])
+    assert math.isnan(results[2])
+    with pytest.raises(ValueError, match="no-arbitrage bounds"):
+        black_implied_volatility(intrinsic - 0.01, _FORWARD, 90.0, 1.0, _DISCOUNT_FACTOR, True)
@@ -1,35 +1,27 @@
 import pytest
-import json
-from datetime import datetime, timedelta
-from unittest.mock import patch, MagicMock
+from datetime import datetime
+from unittest.mock import Mock, call
 from fastapi import HTTPException
 
 from app.services.market_data import MarketDataService
 from app.services.market_data_provider import MarketDataProvider
 
-
-class TestMarketDataService:
-    """Test suite for the MarketDataService class."""
-
-    def setup_method(self):
-        """Set up test fixtures."""
-        # Create a mock for the provider
-        self.provider_mock = MagicMock(spec=MarketDataProvider)
-        
-        # Patch the _get_provider method to return our mock
-        with patch.object(MarketDataService, '_get_provider', return_value=self.provider_mock):
-            # Create service instance
-            self.service = MarketDataService()
-        
-        # Sample test data
-        self.sample_ticker = "AAPL"
-        self.sample_option_symbol = "O:AAPL230616C00150000"
-        self.sample_expiration_date = (datetime.now() + timedelta(days=30)).strftime("%Y-%m-%d")
-
-    def test_get_ticker_details(self):
-        """Test fetching ticker details."""
-        # Set up mock return value
-        mock_result = {
+pytestmark = pytest.mark.xdist_group("market_data")
+
+# Sample test data
+_SAMPLE_TICKER = "AAPL"
+_SAMPLE_OPTION_SYMBOL = "O:AAPL230616C00150000"
+_SAMPLE_EXPIRATION_DATE = "2099-01-01"  # Fixed far-future date; no test depends on today
+
+# Service calls that pass straight through to the provider:
+# (service method, call args, call kwargs, expected provider args, provider result)
+_DELEGATION_CASES = [
+    pytest.param(
+        "get_ticker_details",
+        (_SAMPLE_TICKER,),
+        {},
+        (_SAMPLE_TICKER,),
+        {
             "ticker": "AAPL",
             "name": "Apple Inc.",
             "market": "stocks",
@@ -42,54 +34,32 @@ class TestMarketDataService:
             "composite_figi": "BBG000B9XRY4",
             "share_class_figi": "BBG001S5N8V8",
             "last_updated_utc": "2023-02-10T00:00:00Z"
-        }
-        self.provider_mock.get_ticker_details.return_value = mock_result
-
-        # Call the method
-        result = self.service.get_ticker_details(self.sample_ticker)
-
-        # Verify the provider method was called correctly
-        self.provider_mock.get_ticker_details.assert_called_once_with(self.sample_ticker)
-        
-        # Verify the result
-        assert result == mock_result
-        assert result["ticker"] == "AAPL"
-        assert result["name"] == "Apple Inc."
-
-    def test_get_stock_price(self):
-        """Test fetching stock price."""
-        # Set up mock return value
-        self.provider_mock.get_stock_price.return_value = 150.25
-
-        # Call the method
-        result = self.service.get_stock_price(self.sample_ticker)
-
-        # Verify the provider method was called correctly
-        self.provider_mock.get_stock_price.assert_called_once_with(self.sample_ticker)
-        
-        # Verify the result
-        assert result == 150.25
-
-    def test_get_stock_price_not_found(self):
-        """Test error handling when stock price is not found."""
-        # Set up mock to raise HTTPException
-        self.provider_mock.get_stock_price.side_effect = HTTPException(
-            status_code=404, 
-            detail=f"No price data found for {self.sample_ticker}"
-        )
-
-        # Call the method and expect an exception
-        with pytest.raises(HTTPException) as excinfo:
-            self.service.get_stock_price(self.sample_ticker)
-        
-        # Verify the exception
-        assert excinfo.value.status_code == 404
-        assert f"No price data found for {self.sample_ticker}" in str(excinfo.value.detail)
-
-    def test_get_option_chain(self):
-        """Test fetching option chain."""
-        # Set up mock return value
-        mock_result = [
+        },
+        id="ticker_details",
+    ),
+    pytest.param(
+        # The actual caching is implemented in the provider classes
+        "get_ticker_details",
+        (_SAMPLE_TICKER,),
+        {},
+        (_SAMPLE_TICKER,),
+        {"ticker": "AAPL", "name": "Apple Inc.", "market": "stocks"},
+        id="caching_delegates_to_provider",
+    ),
+    pytest.param(
+        "get_stock_price",
+        (_SAMPLE_TICKER,),
+        {},
+        (_SAMPLE_TICKER,),
+        150.25,
+        id="stock_price",
+    ),
+    pytest.param(
+        "get_option_chain",
+        (_SAMPLE_TICKER,),
+        {"expiration_date": _SAMPLE_EXPIRATION_DATE},
+        (_SAMPLE_TICKER, _SAMPLE_EXPIRATION_DATE),
+        [
             {
                 "underlying_ticker": "AAPL",
                 "ticker": "O:AAPL230616C00150000",
@@ -106,33 +76,16 @@ class TestMarketDataService:
                 "contract_type": "put",
                 "exercise_style": "american"
             }
-        ]
-        self.provider_mock.get_option_chain.return_value = mock_result
-
-        # Call the method
-        result = self.service.get_option_chain(
-            self.sample_ticker, 
-            expiration_date=self.sample_expiration_date
-        )
-
-        # Verify the provider method was called correctly
-        self.provider_mock.get_option_chain.assert_called_once_with(
-            self.sample_ticker, 
-            self.sample_expiration_date
-        )
-        
-        # Verify the result
-        assert len(result) == 2
-        assert result[0]["underlying_ticker"] == "AAPL"
-        assert result[0]["strike_price"] == 150.0
-        assert result[0]["contract_type"] == "call"
-        assert result[1]["contract_type"] == "put"
-
-    def test_get_option_data(self):
-        """Test fetching option data."""
-        # Set up mock return value
-        mock_result = {
-            "symbol": self.sample_option_symbol,
+        ],
+        id="option_chain",
+    ),
+    pytest.param(
+        "get_option_data",
+        (_SAMPLE_TICKER, datetime(2023, 6, 16), 150.0, "call"),
+        {},
+        (_SAMPLE_TICKER, datetime(2023, 6, 16), 150.0, "call"),
+        {
+            "symbol": _SAMPLE_OPTION_SYMBOL,
             "price": 5.75,
             "bid": 5.70,
             "ask": 5.80,
@@ -145,81 +98,15 @@ class TestMarketDataService:
             "vega": 0.2,
             "rho": 0.01,
             "timestamp": 1677685200000
-        }
-        # Ensure the method exists on the mock
-        if not hasattr(self.provider_mock, 'get_option_data'):
-            self.provider_mock.get_option_data = MagicMock()
-        self.provider_mock.get_option_data.return_value = mock_result
-
-        # Set sample parameters
-        expiration_date = datetime.strptime("2023-06-16", "%Y-%m-%d")
-        strike = 150.0
-        option_type = "call"
-
-        # Call the method
-        result = self.service.get_option_data(
-            self.sample_ticker,
-            expiration_date,
-            strike,
-            option_type
-        )
-
-        # Verify the provider method was called correctly
-        self.provider_mock.get_option_data.assert_called_once_with(
-            self.sample_ticker,
-            expiration_date,
-            strike,
-            option_type
-        )
-        
-        # Verify the result
-        assert result == mock_result
-        assert result["symbol"] == self.sample_option_symbol
-        assert result["price"] == 5.75
-
-    def test_api_error_handling(self):
-        """Test handling of API errors."""
-        # For this test we'll directly verify that an exception from the provider is handled
-        
-        # Setup provider mock to raise an exception
-        self.provider_mock.get_ticker_details.side_effect = Exception("API connection error")
-        
-        # The service should wrap provider exceptions in HTTPException
-        with pytest.raises(Exception) as excinfo:
-            self.service.get_ticker_details(self.sample_ticker)
-        
-        # Verify exception details
-        assert "API connection error" in str(excinfo.value)
-        
-        # Reset the mock for other tests
-        self.provider_mock.get_ticker_details.side_effect = None
-
-    def test_caching_mechanism(self):
-        """Test that the service delegates to the provider."""
-        # This test verifies that the service correctly delegates to the provider
-        # The actual caching is now implemented in the provider classes
-        
-        # Set up mock return value
-        expected_result = {
-            "ticker": "AAPL",
-            "name": "Apple Inc.",
-            "market": "stocks"
-        }
-        self.provider_mock.get_ticker_details.return_value = expected_result
-        
-        # Call the method
-        result = self.service.get_ticker_details(self.sample_ticker)
-        
-        # Verify the provider was called correctly
-        self.provider_mock.get_ticker_details.assert_called_once_with(self.sample_ticker)
-        
-        # Verify the result
-        assert result == expected_result
-
-    def test_historical_prices(self):
-        """Test fetching historical prices."""
-        # Set up mock return value
-        mock_result = [
+        },
+        id="option_data",
+    ),
+    pytest.param(
+        "get_historical_prices",
+        (_SAMPLE_TICKER,),
+        {"start_date": datetime(2023, 3, 1), "end_date": datetime(2023, 3, 3), "interval": "day"},
+        (_SAMPLE_TICKER, datetime(2023, 3, 1), datetime(2023, 3, 3), "day"),
+        [
             {
                 "v": 55627300,  # volume
                 "o": 148.75,    # open
@@ -236,70 +123,96 @@ class TestMarketDataService:
                 "l": 149.95,
                 "t": 1677771600000
             }
-        ]
-        self.provider_mock.get_historical_prices.return_value = mock_result
+        ],
+        id="historical_prices",
+    ),
+    pytest.param(
+        "get_option_strikes",
+        (_SAMPLE_TICKER, datetime(2023, 6, 16), "call"),
+        {},
+        (_SAMPLE_TICKER, datetime(2023, 6, 16), "call"),
+        {
+            "strikes": [140.0, 145.0, 150.0, 155.0, 160.0],
+            "count": 5
+        },
+        id="option_strikes",
+    ),
+]
+
+
+@pytest.fixture(scope="class")
+def market_data_service(request):
+    """Build one MarketDataService around a mocked provider for the test class."""
+    provider_mock = Mock(spec=MarketDataProvider)
+    request.cls.provider_mock = provider_mock
+    request.cls.service = MarketDataService(provider=provider_mock)
+
+
+@pytest.mark.usefixtures("market_data_service")
+class TestMarketDataService:
+    """Test suite for the MarketDataService class."""
+
+    # Sample test data
+    sample_ticker = _SAMPLE_TICKER
+    sample_option_symbol = _SAMPLE_OPTION_SYMBOL
+    sample_expiration_date = _SAMPLE_EXPIRATION_DATE
+
+    @pytest.fixture(autouse=True)
+    def reset_provider_mock(self):
+        """Clear return values, side effects and calls on the shared provider mock."""
+        yield
+        self.provider_mock.reset_mock(return_value=True, side_effect=True)
+
+    @pytest.mark.parametrize(
+        "method,args,kwargs,expected_args,mock_result", _DELEGATION_CASES
+    )
+    def test_delegates_to_provider(self, method, args, kwargs, expected_args, mock_result):
+        """Test that data lookups are delegated to the provider unchanged."""
+        # Set up mock return value, adding methods missing from the provider interface
+        if not hasattr(self.provider_mock, method):
+            setattr(self.provider_mock, method, Mock())
+        provider_method = getattr(self.provider_mock, method)
+        provider_method.return_value = mock_result
 
         # Call the method
-        start_date = datetime(2023, 3, 1)
-        end_date = datetime(2023, 3, 3)
-        result = self.service.get_historical_prices(
-            self.sample_ticker,
-            start_date=start_date,
-            end_date=end_date,
-            interval="day"
-        )
+        result = getattr(self.service, method)(*args, **kwargs)
 
         # Verify the provider method was called correctly
-        self.provider_mock.get_historical_prices.assert_called_once_with(
-            self.sample_ticker,
-            start_date,
-            end_date,
-            "day"
-        )
-        
+        assert provider_method.call_args_list == [call(*expected_args)]
+
         # Verify the result
-        assert len(result) == 2
-        assert result[0]["o"] == 148.75
-        assert result[0]["c"] == 150.25
-        assert result[1]["o"] == 150.25
-        assert result[1]["c"] == 152.87
-        
-    def test_get_option_strikes(self):
-        """Test fetching option strikes."""
-        # Set up mock return value
-        mock_result = {
-            "strikes": [140.0, 145.0, 150.0, 155.0, 160.0],
-            "count": 5
-        }
-        self.provider_mock.get_option_strikes.return_value = mock_result
+        assert result == mock_result
 
-        # Test parameters
-        expiration_date = datetime.strptime("2023-06-16", "%Y-%m-%d")
-        option_type = "call"
-        
-        # Call the method
-        result = self.service.get_option_strikes(
-            self.sample_ticker,
-            expiration_date,
-            option_type
+    def test_get_stock_price_not_found(self):
+        """Test error handling when stock price is not found."""
+        # Set up mock to raise HTTPException
+        self.provider_mock.get_stock_price.side_effect = HTTPException(
+            status_code=404, 
+            detail=f"No price data found for {self.sample_ticker}"
         )
 
-        # Verify the provider method was called correctly
-        self.provider_mock.get_option_strikes.assert_called_once_with(
-            self.sample_ticker,
-            expiration_date,
-            option_type
-        )
+        # Call the method and expect an exception
+        with pytest.raises(HTTPException) as excinfo:
+            self.service.get_stock_price(self.sample_ticker)
         
-        # Verify the result
-        assert "strikes" in result
-        assert len(result["strikes"]) == 5
-        assert result["strikes"][2] == 150.0
-        assert result["count"] == 5
+        # Verify the exception
+        assert excinfo.value.status_code == 404
+        assert f"No price data found for {self.sample_ticker}" in str(excinfo.value.detail)
+
+    def test_api_error_handling(self):
+        """Test handling of API errors."""
+        # For this test we'll directly verify that an exception from the provider is handled
+        
+        # Setup provider mock to raise an exception
+        self.provider_mock.get_ticker_details.side_effect = Exception("API connection error")
+        
+        # The provider error should propagate with its message intact
+        with pytest.raises(Exception, match="API connection error"):
+            self.service.get_ticker_details(self.sample_ticker)
 
+    @pytest.mark.skip(reason="Market data search functionality not fully implemented yet")
     def test_search_tickers(self):
         """Test searching for tickers."""
-        pytest.skip("Market data search functionality not fully implemented yet")
         # Set up mock return value
         mock_result = [
             {"ticker": "AAPL", "name": "Apple Inc.", "market": "stocks"},
@@ -312,7 +225,7 @@ class TestMarketDataService:
         result = self.service.search_tickers(query)
 
         # Verify the provider method was called correctly
-        self.provider_mock.search_tickers.assert_called_once_with(query)
+        assert self.provider_mock.search_tickers.call_args_list == [call(query)]
         
         # Verify the result
         assert len(result) == 2
@@ -320,9 +233,9 @@ class TestMarketDataService:
         assert result[0]["market"] == "stocks"
         assert result[1]["ticker"] == "AAPL.X"
 
+    @pytest.mark.skip(reason="Market status functionality not fully implemented yet")
     def test_get_market_status(self):
         """Test getting market status."""
-        pytest.skip("Market status functionality not fully implemented yet")
         # Set up mock return value
         mock_result = {
             "market": "open",
@@ -345,9 +258,9 @@ class TestMarketDataService:
         assert "server_time" in result
         assert result["exchanges"]["nyse"] == "open"
 
+    @pytest.mark.skip(reason="Earnings calendar functionality not fully implemented yet")
     def test_get_earnings_calendar(self):
         """Test fetching earnings calendar."""
-        pytest.skip("Earnings calendar functionality not fully implemented yet")
         # Set up mock return value
         mock_result = [
             {
@@ -374,11 +287,9 @@ class TestMarketDataService:
         )
 
         # Verify the provider method was called correctly
-        self.provider_mock.get_earnings_calendar.assert_called_once_with(
-            self.sample_ticker,
-            from_date,
-            to_date
-        )
+        assert self.provider_mock.get_earnings_calendar.call_args_list == [
+            call(self.sample_ticker, from_date, to_date)
+        ]
         
         # Verify the result
         assert len(result) == 1
@@ -386,9 +297,9 @@ class TestMarketDataService:
         assert result[0]["quarter"] == "Q3 2023"
         assert result[0]["estimate_eps"] == 1.5
 
+    @pytest.mark.skip(reason="Economic calendar functionality not fully implemented yet")
     def test_get_economic_calendar(self):
         """Test fetching economic calendar."""
-        pytest.skip("Economic calendar functionality not fully implemented yet")
         # Set up mock return value
         mock_result = [
             {
@@ -414,10 +325,9 @@ class TestMarketDataService:
         )
 
         # Verify the provider method was called correctly
-        self.provider_mock.get_economic_calendar.assert_called_once_with(
-            from_date,
-            to_date
-        )
+        assert self.provider_mock.get_economic_calendar.call_args_list == [
+            call(from_date, to_date)
+        ]
         
         # Verify the result
         assert len(result) == 1
@@ -425,9 +335,9 @@ class TestMarketDataService:
         assert result[0]["importance"] == "high"
         assert result[0]["date"] == "2023-07-07"
 
+    @pytest.mark.skip(reason="Implied volatility functionality not fully implemented yet")
     def test_get_implied_volatility(self):
         """Test getting implied volatility."""
-        pytest.skip("Implied volatility functionality not fully implemented yet")
         # Set up mock return value
         self.provider_mock.get_implied_volatility.return_value = 0.25
 
@@ -435,9 +345,9 @@ class TestMarketDataService:
         result = self.service.get_implied_volatility(self.sample_ticker)
 
         # Verify the provider method was called correctly
-        self.provider_mock.get_implied_volatility.assert_called_once_with(
-            self.sample_ticker
-        )
+        assert self.provider_mock.get_implied_volatility.call_args_list == [
+            call(self.sample_ticker)
+        ]
         
         # Verify the result
         assert result == 0.25
\ No newline at end of file
@@ -1,21 +1,31 @@
+import numpy as np
 import pytest
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
-from app.services.option_pricing import OptionPricer
+from app.services.option_pricing import OptionPricer, _price_european
 
+# Sample expiration date, computed once at import time
+_EXPIRATION_DATE = datetime.now() + timedelta(days=30)
 
+
+@pytest.fixture(scope="class")
+def option_pricer(request):
+    """Build one OptionPricer for the test class."""
+    request.cls.pricer = OptionPricer()
+
+
+@pytest.mark.usefixtures("option_pricer")
 class TestOptionPricer:
     """Test suite for the OptionPricer class."""
 
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.pricer = OptionPricer()
-        self.spot_price = 100.0
-        self.strike = 100.0
-        self.volatility = 0.2
-        self.risk_free_rate = 0.05
-        self.dividend_yield = 0.0
-        self.expiration_date = datetime.now() + timedelta(days=30)
+    # Sample option parameters
+    spot_price = 100.0
+    strike = 100.0
+    volatility = 0.2
+    risk_free_rate = 0.05
+    dividend_yield = 0.0
+    expiration_date = _EXPIRATION_DATE
 
     def test_price_european_call(self):
         """Test pricing a European call option."""
@@ -119,4 +129,211 @@ class TestOptionPricer:
             american=False,
         )
 
-        assert result["price"] >= european_result["price"] 
\ No newline at end of file
+        assert result["price"] >= european_result["price"] 
+
+    def test_price_option_batch_matches_scalar(self):
+        """Test that batch pricing matches scalar European pricing."""
+        results = [
+            self.pricer.price_option(
+                option_type=option_type,
+                strike=self.strike,
+                expiration_date=self.expiration_date,
+                spot_price=self.spot_price,
+                volatility=self.volatility,
+                risk_free_rate=self.risk_free_rate,
+                dividend_yield=self.dividend_yield,
+                american=False,
+            )
+            for option_type in ("call", "put")
+        ]
+
+        batch = self.pricer.price_option_batch(
+            option_type=np.array(["call", "put"]),
+            strike=self.strike,
+            time_to_expiry=results[0]["time_to_expiry"],
+            spot_price=self.spot_price,
+            volatility=self.volatility,
+            risk_free_rate=self.risk_free_rate,
+            dividend_yield=self.dividend_yield,
+        )
+
+        for key in ("price", "delta", "gamma", "theta", "vega", "rho"):
+            expected = [result[key] for result in results]
+            assert batch[key] == pytest.approx(expected, rel=1e-6), key
+
+    @pytest.mark.parametrize("option_type", ["call", "put"])
+    def test_calculate_implied_volatility_european_round_trip(self, option_type):
+        """Test that European implied volatility recovers the pricing volatility."""
+        result = self.pricer.price_option(
+            option_type=option_type,
+            strike=110.0,
+            expiration_date=self.expiration_date,
+            spot_price=self.spot_price,
+            volatility=0.35,
+            risk_free_rate=self.risk_free_rate,
+            dividend_yield=0.01,
+            american=False,
+        )
+
+        implied_vol = self.pricer.calculate_implied_volatility(
+            option_type=option_type,
+            option_price=result["price"],
+            strike=110.0,
+            expiration_date=self.expiration_date,
+            spot_price=self.spot_price,
+            risk_free_rate=self.risk_free_rate,
+            dividend_yield=0.01,
+            american=False,
+        )
+
+        assert implied_vol == pytest.approx(0.35, rel=1e-6)
+
+    def test_price_option_reuses_cached_european_result(self):
+        """Test that repeat European quotes hit the shared cache, even from a new pricer."""
+        kwargs = dict(
+            option_type="call",
+            strike=self.strike,
+            expiration_date=self.expiration_date,
+            spot_price=self.spot_price,
+            volatility=self.volatility,
+            risk_free_rate=self.risk_free_rate,
+            dividend_yield=self.dividend_yield,
+            american=False,
+        )
+
+        first = self.pricer.price_option(**kwargs)
+        hits = _price_european.cache_info().hits
+        first["price"] = -1.0
+        second = OptionPricer().price_option(**kwargs)
+
+        assert _price_european.cache_info().hits == hits + 1
+        assert second["price"] > 0
+
+    @pytest.mark.parametrize("american", [False, True], ids=["european", "american"])
+    def test_price_option_tau_matches_price_option(self, american):
+        """Test that pricing from a year fraction matches pricing from a date."""
+        by_date = self.pricer.price_option(
+            option_type="put",
+            strike=self.strike,
+            expiration_date=self.expiration_date,
+            spot_price=self.spot_price,
+            volatility=self.volatility,
+            risk_free_rate=self.risk_free_rate,
+            dividend_yield=self.dividend_yield,
+            american=american,
+        )
+
+        by_tau = self.pricer.price_option_tau(
+            option_type="put",
+            strike=self.strike,
+            time_to_expiry=by_date["time_to_expiry"],
+            spot_price=self.spot_price,
+            volatility=self.volatility,
+            risk_free_rate=self.risk_free_rate,
+            dividend_yield=self.dividend_yield,
+            american=american,
+        )
+
+        assert by_tau == by_date
+
+    def test_create_process_reuses_quantlib_objects(self):
+        """Test that market inputs are rebound on one shared process."""
+        day_count = self.pricer.day_count
+        first = self.pricer._create_process(100.0, 0.05, 0.2, 0.0)
+        second = self.pricer._create_process(105.0, 0.03, 0.25, 0.01)
+
+        assert second is first
+        assert self.pricer.day_count is day_count
+        assert second.x0() == 105.0
+
+    def test_shared_pricer_is_thread_safe(self):
+        """Test that threads sharing a pricer never price with each other's quotes."""
+        spots = [80.0, 120.0]
+
+        def price(spot_price):
+            return self.pricer.price_option(
+                option_type="put",
+                strike=self.strike,
+                expiration_date=self.expiration_date,
+                spot_price=spot_price,
+                volatility=self.volatility,
+                risk_free_rate=self.risk_free_rate,
+                dividend_yield=self.dividend_yield,
+                american=True,
+            )["price"]
+
+        expected = {spot_price: price(spot_price) for spot_price in spots}
+        requested = spots * 40
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            prices = list(executor.map(price, requested))
+
+        assert prices == [expected[spot_price] for spot_price in requested]
+
+    def test_price_european_applies_vega_and_rho_floors(self):
+        """Test that far out-of-the-money European Greeks keep the minimum floors."""
+        result = self.pricer.price_option(
+            option_type="put",
+            strike=20.0,
+            expiration_date=self.expiration_date,
+            spot_price=self.spot_price,
+            volatility=self.volatility,
+            risk_free_rate=self.risk_free_rate,
+            dividend_yield=self.dividend_yield,
+            american=False,
+        )
+
+        assert result["vega"] == pytest.approx(1e-5)
+        assert result["rho"] == pytest.approx(-1e-6)
+
+    def test_price_european_floors_put_rho_negative(self):
+        """Test that a put whose rho underflows to -0.0 floors to a negative rho."""
+        result = self.pricer.price_option_tau(
+            option_type="put",
+            strike=50.0,
+            time_to_expiry=1 / 365,
+            spot_price=self.spot_price,
+            volatility=0.01,
+            risk_free_rate=self.risk_free_rate,
+            dividend_yield=self.dividend_yield,
+            american=False,
+        )
+
+        assert result["rho"] == pytest.approx(-1e-6)
+
+    def test_price_option_batch_limits_at_expiry_and_zero_volatility(self):
+        """Test that degenerate contracts price at their limits instead of NaN."""
+        batch = self.pricer.price_option_batch(
+            option_type=np.array(["call", "put", "call", "put"]),
+            strike=np.array([95.0, 95.0, 100.0, 105.0]),
+            time_to_expiry=np.array([0.0, 0.0, 0.0, 1 / (365 * 1440)]),
+            spot_price=self.spot_price,
+            volatility=self.volatility,
+            risk_free_rate=self.risk_free_rate,
+            dividend_yield=self.dividend_yield,
+        )
+
+        for key in ("price", "delta", "gamma", "theta", "vega", "rho"):
+            assert np.all(np.isfinite(batch[key])), key
+        assert batch["price"][:3] == pytest.approx([5.0, 0.0, 0.0])
+        assert batch["price"][3] == pytest.approx(5.0, abs=1e-3)
+        assert batch["delta"][:3] == pytest.approx([0.01, 0.0, 0.005])
+        assert batch["gamma"][:3] == pytest.approx([0.0, 0.0, 0.0])
+
+    def test_price_european_zero_volatility_is_discounted_intrinsic(self):
+        """Test that a zero-volatility European call prices at forward intrinsic value."""
+        result = self.pricer.price_option(
+            option_type="call",
+            strike=95.0,
+            expiration_date=self.expiration_date,
+            spot_price=self.spot_price,
+            volatility=0.0,
+            risk_free_rate=self.risk_free_rate,
+            dividend_yield=self.dividend_yield,
+            american=False,
+        )
+
+        time_to_expiry = result["time_to_expiry"]
+        expected = self.spot_price - 95.0 * np.exp(-self.risk_free_rate * time_to_expiry)
+        assert result["price"] == pytest.approx(expected)
+        assert result["delta"] == pytest.approx(0.01)
+        assert result["gamma"] == 0.0
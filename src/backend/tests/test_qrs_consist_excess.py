@@ -1,28 +1,61 @@
 from __future__ import annotations
 
+import math
+
+import numpy as np
+import pytest
+
 from app.security_scan.indicators.qrs_consist_excess import (
     _build_main_zero_cross_signals,
     _build_ma1_ma2_cross_signals,
     _build_main_vs_all_mas_regime_signals,
+    _benchmark_state_from_bytes,
+    _rolling_std,
+    _rolling_sum,
+    _sma,
     align_qrs_consist_excess_inputs,
     qrs_consist_excess,
 )
 
 
-def test_qrs_main_cross_above_zero_requires_three_days() -> None:
+@pytest.mark.parametrize(
+    "series,expected_type,expected_label,prevs",
+    [
+        (
+            [-1.0, -0.5, 0.0, 0.2],
+            "main_cross_above_zero_3d",
+            "qrs_main_cross_up_3d",
+            (0.0, -0.5, -1.0),
+        ),
+        (
+            [0.1, 0.0, 0.2, -0.3],
+            "main_cross_below_zero_3d",
+            "qrs_main_cross_down_3d",
+            (0.2, 0.0, 0.1),
+        ),
+    ],
+    ids=["above", "below"],
+)
+def test_qrs_main_cross_zero_requires_three_days(
+    series: list[float],
+    expected_type: str,
+    expected_label: str,
+    prevs: tuple[float, float, float],
+) -> None:
     dates = ["2025-01-01", "2025-01-02", "2025-01-03", "2025-01-04"]
-    series = [-1.0, -0.5, 0.0, 0.2]
 
     signals = _build_main_zero_cross_signals(dates, series)
 
     assert len(signals) == 1
     signal = signals[0]
-    assert signal.signal_type == "main_cross_above_zero_3d"
+    assert signal.signal_type == expected_type
     assert signal.signal_date == "2025-01-04"
-    assert signal.metadata["label"] == "qrs_main_cross_up_3d"
-    assert signal.metadata["prev_1"] == 0.0
-    assert signal.metadata["prev_2"] == -0.5
-    assert signal.metadata["prev_3"] == -1.0
+    assert signal.metadata["label"] == expected_label
+    assert (
+        signal.metadata["prev_1"],
+        signal.metadata["prev_2"],
+        signal.metadata["prev_3"],
+    ) == prevs
 
 
 def test_align_qrs_consist_excess_inputs_tracks_shared_dates_and_dropped_rows() -> None:
@@ -82,29 +115,28 @@ def test_align_qrs_consist_excess_inputs_rejects_missing_benchmark_series() -> N
         raise AssertionError("Expected missing benchmark prices to raise ValueError")
 
 
-def test_qrs_main_cross_below_zero_requires_three_days() -> None:
-    dates = ["2025-02-01", "2025-02-02", "2025-02-03", "2025-02-04"]
-    series = [0.1, 0.0, 0.2, -0.3]
+def test_qrs_main_cross_requires_full_streak() -> None:
+    dates = ["2025-03-01", "2025-03-02", "2025-03-03"]
+    series = [-1.0, -0.5, 0.3]
 
     signals = _build_main_zero_cross_signals(dates, series)
 
-    assert len(signals) == 1
-    signal = signals[0]
-    assert signal.signal_type == "main_cross_below_zero_3d"
-    assert signal.signal_date == "2025-02-04"
-    assert signal.metadata["label"] == "qrs_main_cross_down_3d"
-    assert signal.metadata["prev_1"] == 0.2
-    assert signal.metadata["prev_2"] == 0.0
-    assert signal.metadata["prev_3"] == 0.1
+    assert signals == []
 
 
-def test_qrs_main_cross_requires_full_streak() -> None:
-    dates = ["2025-03-01", "2025-03-02", "2025-03-03"]
-    series = [-1.0, -0.5, 0.3]
+def test_qrs_main_zero_cross_signals_follow_series_order() -> None:
+    dates = [f"2025-04-{day:02d}" for day in range(1, 12)]
+    series = [-1.0, -0.5, -0.2, 0.4, 0.6, 0.1, 0.3, -0.2, -0.1, -0.4, 0.5]
 
     signals = _build_main_zero_cross_signals(dates, series)
 
-    assert signals == []
+    assert [(signal.signal_date, signal.signal_type) for signal in signals] == [
+        ("2025-04-04", "main_cross_above_zero_3d"),
+        ("2025-04-08", "main_cross_below_zero_3d"),
+        ("2025-04-11", "main_cross_above_zero_3d"),
+    ]
+    assert signals[1].metadata["current_value"] == -0.2
+    assert signals[1].metadata["prev_1"] == 0.3
 
 
 def test_qrs_ma1_cross_above_ma2_emits_signal() -> None:
@@ -167,13 +199,41 @@ def test_qrs_main_below_all_mas_neg_regime_requires_regime_and_transition() -> N
     assert signal.metadata["label"] == "qrs_main_below_all_mas_neg_regime"
 
 
-def test_qrs_consist_excess_v2_confidence_weighting_avoids_hard_zero_plateau() -> None:
+def test_qrs_signal_builders_accept_numpy_arrays() -> None:
+    dates = [f"2025-06-{day:02d}" for day in range(1, 7)]
+    main = [-1.0, -0.5, -0.2, 2.0, 1.5, -0.4]
+    ma1 = [-0.3, -0.1, 0.4, 1.2, 0.8, 0.1]
+    ma2 = [0.2, 0.3, 0.3, 1.0, 0.9, 0.2]
+    ma3 = [0.5, 0.5, 0.6, 0.7, 0.7, 0.6]
+    arrays = [np.asarray(series) for series in (main, ma1, ma2, ma3)]
+
+    cases = [
+        (_build_main_zero_cross_signals, (main,), arrays[:1]),
+        (_build_ma1_ma2_cross_signals, (ma1, ma2), arrays[1:3]),
+        (_build_main_vs_all_mas_regime_signals, (main, ma1, ma2, ma3), arrays),
+    ]
+    for builder, list_inputs, array_inputs in cases:
+        expected = builder(dates, *list_inputs)
+        signals = builder(dates, *array_inputs)
+
+        assert expected
+        assert signals == expected
+        for signal in signals:
+            assert all(
+                type(value) is float
+                for value in signal.metadata.values()
+                if not isinstance(value, str)
+            )
+
+
+@pytest.mark.parametrize("n", [140, 252, 1260, 2520])
+def test_qrs_consist_excess_v2_confidence_weighting_avoids_hard_zero_plateau(n: int) -> None:
     # Benchmark is consistently up; stock consistently outperforms.
     # v2 logic should output a non-zero series even when one-sided market direction
     # would have failed the old hard "up+down day minimums" gate.
-    n = 140
-    stock_close = [100.0 * (1.02**i) for i in range(n)]
-    bench_close = [100.0 * (1.01**i) for i in range(n)]
+    days = np.arange(n)
+    stock_close = 100.0 * np.power(1.02, days)
+    bench_close = 100.0 * np.power(1.01, days)
 
     outputs = qrs_consist_excess(
         stock_close,
@@ -197,4 +257,27 @@ def test_qrs_consist_excess_v2_confidence_weighting_avoids_hard_zero_plateau() -
     assert len(qrs) == n
     assert qrs == qrs_v2
     assert any(abs(value) > 0 for value in qrs)
-    assert qrs[-1] > 0
+    # Once the lookback is full: consistency 1, excess 1% over the 0.1 std floor,
+    # and all-up-day balance confidence 16.8 / 100.8, so (0.6 + 0.4 * 10) / 6
+    assert qrs[-1] == pytest.approx(23 / 30, rel=1e-9)
+
+
+def test_qrs_rolling_helpers_use_partial_windows_and_skip_nan() -> None:
+    series = np.array([1.0, math.nan, 3.0, 5.0])
+
+    assert _rolling_sum(series, 2).tolist() == [1.0, 1.0, 3.0, 8.0]
+    assert _sma(series, 2).tolist() == [1.0, 1.0, 3.0, 4.0]
+    assert _rolling_std(series, 3).tolist() == [0.0, 0.0, 1.0, 1.0]
+
+
+def test_qrs_consist_excess_reuses_benchmark_state_across_tickers() -> None:
+    days = np.arange(120)
+    bench_close = 100.0 * np.power(1.01, days)
+    _benchmark_state_from_bytes.cache_clear()
+
+    first = qrs_consist_excess(100.0 * np.power(1.02, days), bench_close, bench_close, bench_close)
+    second = qrs_consist_excess(100.0 * np.power(1.005, days), bench_close, bench_close, bench_close)
+
+    cache_info = _benchmark_state_from_bytes.cache_info()
+    assert (cache_info.hits, cache_info.misses) == (1, 1)
+    assert first["QRSConsistExcess"][-1] > 0 > second["QRSConsistExcess"][-1]
@@ -6,27 +6,33 @@ from unittest.mock import patch, MagicMock
 from app.services.scenario_engine import ScenarioEngine
 from app.services.option_pricing import OptionPricer
 
+# Sample expiration date, computed once at import time
+_SAMPLE_EXPIRATION_DATE = datetime.now() + timedelta(days=30)
 
+
+@pytest.fixture(scope="class")
+def scenario_engine(request):
+    """Build one OptionPricer and ScenarioEngine for the test class."""
+    request.cls.option_pricer = OptionPricer()
+    request.cls.scenario_engine = ScenarioEngine(option_pricer=request.cls.option_pricer)
+
+
+@pytest.mark.usefixtures("scenario_engine")
 class TestScenarioEngine:
     """Test suite for the ScenarioEngine class."""
 
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.option_pricer = OptionPricer()
-        self.scenario_engine = ScenarioEngine(option_pricer=self.option_pricer)
-        
-        # Sample option data
-        self.sample_expiration_date = datetime.now() + timedelta(days=30)
-        self.option_data = {
-            "option_type": "call",
-            "strike": 100.0,
-            "expiration_date": self.sample_expiration_date,
-            "spot_price": 100.0,
-            "volatility": 0.2,
-            "risk_free_rate": 0.05,
-            "dividend_yield": 0.0,
-            "american": False
-        }
+    # Sample option data
+    sample_expiration_date = _SAMPLE_EXPIRATION_DATE
+    option_data = {
+        "option_type": "call",
+        "strike": 100.0,
+        "expiration_date": _SAMPLE_EXPIRATION_DATE,
+        "spot_price": 100.0,
+        "volatility": 0.2,
+        "risk_free_rate": 0.05,
+        "dividend_yield": 0.0,
+        "american": False
+    }
 
     def test_price_vs_volatility_surface(self):
         """Test generating a price vs volatility surface."""